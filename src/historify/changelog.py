@@ -12,7 +12,7 @@ from typing import Optional, Dict, List, Tuple, Any
 from historify.config import RepositoryConfig, ConfigError
 from historify.hash import hash_file
 from historify.minisign import minisign_sign, minisign_verify, MinisignError
-from historify.csv_manager import CSVManager, CSVError
+from historify.csv_manager import CSVManager, CSVError, CHANGELOG_FIELDS
 
 logger = logging.getLogger(__name__)
 
@@ -23,22 +23,27 @@ class ChangelogError(Exception):
 class Changelog:
     """Manages historify changelog files and signatures."""
     
-    def __init__(self, repo_path: str):
+    def __init__(self, repo_path: str, config: Optional[RepositoryConfig] = None):
         """
         Initialize a Changelog object.
         
         Args:
             repo_path: Path to the repository.
+            config: Already loaded configuration for the repository. When
+                omitted, the configuration is loaded from disk.
             
         Raises:
             ChangelogError: If the repository is not properly initialized.
         """
-        self.repo_path = Path(repo_path).resolve()
+        self.repo_path = Path(os.path.abspath(repo_path))
         
-        try:
-            self.config = RepositoryConfig(repo_path)
-        except ConfigError as e:
-            raise ChangelogError(f"Repository configuration error: {e}")
+        if config is not None:
+            self.config = config
+        else:
+            try:
+                self.config = RepositoryConfig(repo_path)
+            except ConfigError as e:
+                raise ChangelogError(f"Repository configuration error: {e}")
         
         self.db_dir = self.repo_path / "db"
         self.seed_file = self.db_dir / "seed.bin"
@@ -52,17 +57,7 @@ class Changelog:
         self.changes_dir.mkdir(parents=True, exist_ok=True)
         
         # Required fields for changelog CSV
-        self.required_fields = [
-            "timestamp",
-            "transaction_type", 
-            "path",
-            "category",
-            "size",
-            "ctime",
-            "mtime",
-            "sha256",
-            "blake3"
-        ]
+        self.required_fields = list(CHANGELOG_FIELDS)
         
         # Try to get minisign keys
         self.minisign_key = self.config.get("minisign.key")
@@ -71,6 +66,25 @@ class Changelog:
         # Initialize CSV manager
         self.csv_manager = CSVManager(repo_path)
     
+    def _scan_changes_dir(self) -> Tuple[List[str], set]:
+        """
+        List the changes directory in a single pass.
+        
+        Returns:
+            Tuple of (sorted changelog file names, set of all entry names).
+        """
+        try:
+            with os.scandir(self.changes_dir) as it:
+                names = {entry.name for entry in it}
+        except FileNotFoundError:
+            return [], set()
+        
+        changelog_names = sorted(
+            name for name in names
+            if name.startswith("changelog-") and name.endswith(".csv")
+        )
+        return changelog_names, names
+    
     def get_current_changelog(self) -> Optional[Path]:
         """
         Get the path to the current open changelog file.
@@ -78,14 +92,12 @@ class Changelog:
         Returns:
             Path to the current changelog file, or None if no open changelog.
         """
-        # List all changelog files
-        changelog_files = sorted(self.changes_dir.glob("changelog-*.csv"))
+        changelog_names, names = self._scan_changes_dir()
         
         # Check each file to see if it's signed
-        for changelog_file in reversed(changelog_files):  # Start with most recent
-            sig_file = changelog_file.with_suffix(".csv.minisig")
-            if not sig_file.exists():
-                return changelog_file
+        for name in reversed(changelog_names):  # Start with most recent
+            if f"{name}.minisig" not in names:
+                return self.changes_dir / name
         
         # No open changelog file found
         return None
@@ -97,8 +109,8 @@ class Changelog:
         Returns:
             Path to the latest changelog file, or None if no changelog.
         """
-        changelog_files = sorted(self.changes_dir.glob("changelog-*.csv"))
-        return changelog_files[-1] if changelog_files else None
+        changelog_names, _ = self._scan_changes_dir()
+        return self.changes_dir / changelog_names[-1] if changelog_names else None
     
     def create_new_changelog(self) -> Path:
         """
@@ -196,10 +208,17 @@ class Changelog:
             file_path: Path to the file to sync.
         """
         try:
-            # Open the file in append mode (doesn't truncate the file)
-            with open(file_path, "a") as f:
-                # Force OS to sync file to disk
-                os.fsync(f.fileno())
+            # Open read-only so a missing file is not created as a side effect
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                # Force OS to sync file data to disk; fdatasync skips the
+                # metadata-only flush (e.g. atime) that fsync also performs
+                if hasattr(os, "fdatasync"):
+                    os.fdatasync(fd)
+                else:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
             logger.debug(f"File synced to disk: {file_path}")
         except Exception as e:
             logger.warning(f"Failed to sync file to disk (continuing anyway): {e}")
@@ -361,6 +380,12 @@ class Changelog:
         if not self.minisign_key or not self.minisign_pub:
             raise ChangelogError("Minisign keys not configured. Use 'config minisign.key' and 'config minisign.pub'.")
         
+        # Refresh the config.csv view of the configuration at the transaction boundary
+        try:
+            self.config.export_csv()
+        except ConfigError as e:
+            logger.warning(f"Failed to export config.csv: {e}")
+        
         # Get the current open changelog
         current_changelog = self.get_current_changelog()
         
@@ -393,10 +418,11 @@ class Changelog:
                     
                     # Get the latest signed changelog
                     latest_signed = None
-                    for changelog in sorted(self.changes_dir.glob("changelog-*.csv")):
-                        sig_file = changelog.with_suffix(".csv.minisig")
-                        if sig_file.exists():
-                            latest_signed = changelog
+                    changelog_names, names = self._scan_changes_dir()
+                    for name in reversed(changelog_names):
+                        if f"{name}.minisig" in names:
+                            latest_signed = self.changes_dir / name
+                            break
                     
                     # Write a closing transaction referencing the previous changelog or seed
                     if latest_signed:
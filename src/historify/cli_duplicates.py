@@ -36,7 +36,7 @@ def find_duplicates(repo_path: str, category: Optional[str] = None) -> Dict[str,
     try:
         # Initialize config and changelog
         config = RepositoryConfig(str(repo_path))
-        changelog = Changelog(str(repo_path))
+        changelog = Changelog(str(repo_path), config=config)
     except (ConfigError, ChangelogError) as e:
         raise DuplicatesError(f"Failed to initialize repository: {e}")
     
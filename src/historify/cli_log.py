@@ -90,12 +90,20 @@ def read_log_entries(log_file: Path, category: Optional[str] = None) -> List[Dic
     
     try:
         with open(log_file, "r", newline="") as f:
-            reader = csv.DictReader(f)
+            reader = csv.reader(f)
+            fieldnames = next(reader, None)
+            if fieldnames is None:
+                return entries
+            
+            category_idx = fieldnames.index("category") if "category" in fieldnames else None
+            
             for row in reader:
+                if not row:
+                    continue
                 # Apply category filter if specified
-                if category and (not row.get("category") or row["category"] != category):
+                if category and (category_idx is None or category_idx >= len(row) or row[category_idx] != category):
                     continue
-                entries.append(row)
+                entries.append(dict(zip(fieldnames, row)))
     except Exception as e:
         logger.error(f"Error reading log file: {e}")
         raise ChangelogError(f"Failed to read log file: {e}")
@@ -10,7 +10,7 @@ from datetime import datetime, UTC
 
 from historify.changelog import Changelog, ChangelogError
 from historify.config import RepositoryConfig, ConfigError
-from historify.hash import hash_file, HashError
+from historify.hash import scan_file, HashError
 
 logger = logging.getLogger(__name__)
 
@@ -31,15 +31,9 @@ def get_file_metadata(file_path: Path) -> Dict[str, str]:
     Raises:
         ScanError: If the file doesn't exist or metadata can't be gathered.
     """
-    if not file_path.exists() or not file_path.is_file():
-        raise ScanError(f"File does not exist or is not a regular file: {file_path}")
-    
     try:
-        # Get basic file stats
-        stat = file_path.stat()
-        
-        # Get hashes
-        hashes = hash_file(file_path)
+        # Get basic file stats and hashes in a single pass
+        stat, hashes = scan_file(file_path)
         
         # Format timestamps
         ctime = datetime.fromtimestamp(stat.st_ctime, tz=UTC).strftime("%Y-%m-%d %H:%M:%S UTC")
@@ -52,7 +46,11 @@ def get_file_metadata(file_path: Path) -> Dict[str, str]:
             "sha256": hashes.get("sha256", ""),
             "blake3": hashes.get("blake3", "")
         }
-    except (OSError, HashError) as e:
+    except HashError as e:
+        if not file_path.is_file():
+            raise ScanError(f"File does not exist or is not a regular file: {file_path}")
+        raise ScanError(f"Failed to gather metadata for {file_path}: {e}")
+    except OSError as e:
         raise ScanError(f"Failed to gather metadata for {file_path}: {e}")
 
 def walk_directory(directory: Path) -> List[Path]:
@@ -71,42 +69,36 @@ def walk_directory(directory: Path) -> List[Path]:
     files = []
     try:
         for root, _, filenames in os.walk(directory):
-            root_path = Path(root)
             for filename in filenames:
                 # Skip dotfiles and special system files
                 if filename.startswith(".") or filename in ["Thumbs.db", ".DS_Store"]:
                     continue
-                file_path = root_path / filename
-                if file_path.is_file():
-                    files.append(file_path)
+                # Join as strings; only build a Path for files we keep
+                full_path = os.path.join(root, filename)
+                if os.path.isfile(full_path):
+                    files.append(Path(full_path))
     except OSError as e:
         raise ScanError(f"Failed to walk directory {directory}: {e}")
         
     return files
 
-def log_change(changelog: Changelog, change_type: str, path: str, category: str, 
-              metadata: Dict[str, str], old_path: str = None) -> None:
+def build_change_entry(change_type: str, path: str, category: str,
+                       metadata: Dict[str, str], old_path: str = None) -> Dict[str, str]:
     """
-    Log a file change to the changelog.
+    Build a changelog entry for a new, changed or moved file.
     
     Args:
-        changelog: Changelog object.
         change_type: Type of change (new, changed, move).
         path: File path.
         category: Category name.
         metadata: File metadata.
         old_path: Previous path for move transactions.
         
-    Raises:
-        ScanError: If there is no open changelog.
+    Returns:
+        Changelog entry dictionary.
     """
-    current_changelog = changelog.get_current_changelog()
-    if not current_changelog:
-        raise ScanError("No open changelog file. Run 'start' command first.")
-        
-    timestamp = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC")
-    entry = {
-        "timestamp": timestamp,
+    return {
+        "timestamp": datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC"),
         "transaction_type": change_type,
         "path": path,
         "category": category,
@@ -116,7 +108,52 @@ def log_change(changelog: Changelog, change_type: str, path: str, category: str,
         "sha256": metadata["sha256"],
         "blake3": old_path if change_type == "move" else metadata["blake3"]
     }
+
+def build_deletion_entry(path: str, category: str, file_info: Dict[str, str]) -> Dict[str, str]:
+    """
+    Build a changelog entry for a deleted file.
     
+    Args:
+        path: File path.
+        category: Category name.
+        file_info: Information about the deleted file.
+        
+    Returns:
+        Changelog entry dictionary.
+    """
+    return {
+        "timestamp": datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "transaction_type": "deleted",
+        "path": path,
+        "category": category,
+        "size": "",
+        "ctime": "",
+        "mtime": "",
+        "sha256": "",
+        "blake3": file_info["hash"]  # Store the last known hash
+    }
+
+def log_change(changelog: Changelog, change_type: str, path: str, category: str, 
+              metadata: Dict[str, str], old_path: str = None) -> None:
+    """
+    Log a file change to the changelog.
+    
+    Args:
+        changelog: Changelog object.
+        change_type: Type of change (new, changed, move).
+        path: File path.
+        category: Category name.
+        metadata: File metadata.
+        old_path: Previous path for move transactions.
+        
+    Raises:
+        ScanError: If there is no open changelog.
+    """
+    current_changelog = changelog.get_current_changelog()
+    if not current_changelog:
+        raise ScanError("No open changelog file. Run 'start' command first.")
+    
+    entry = build_change_entry(change_type, path, category, metadata, old_path=old_path)
     changelog.csv_manager.append_entry(current_changelog, entry)
 
 def log_deletion(changelog: Changelog, path: str, category: str, file_info: Dict[str, str]) -> None:
@@ -135,20 +172,8 @@ def log_deletion(changelog: Changelog, path: str, category: str, file_info: Dict
     current_changelog = changelog.get_current_changelog()
     if not current_changelog:
         raise ScanError("No open changelog file. Run 'start' command first.")
-        
-    timestamp = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC")
-    entry = {
-        "timestamp": timestamp,
-        "transaction_type": "deleted",
-        "path": path,
-        "category": category,
-        "size": "",
-        "ctime": "",
-        "mtime": "",
-        "sha256": "",
-        "blake3": file_info["hash"]  # Store the last known hash
-    }
     
+    entry = build_deletion_entry(path, category, file_info)
     changelog.csv_manager.append_entry(current_changelog, entry)
 
 def scan_category(repo_path: Path, category: str, category_path: Path, changelog: Changelog) -> Dict[str, int]:
@@ -185,6 +210,9 @@ def scan_category(repo_path: Path, category: str, category_path: Path, changelog
         "error": 0
     }
     
+    # Changelog entries collected during the scan and appended in one batch
+    pending = []
+    
     try:
         # Build current file map from all changelogs
         current_files = {}  # Map of path to {hash, size, mtime}
@@ -224,9 +252,13 @@ def scan_category(repo_path: Path, category: str, category_path: Path, changelog
         
         # Get current files on disk
         files_on_disk = {}
+        category_prefix = os.path.join(str(category_path), "")
+        prefix_len = len(category_prefix)
         for file_path in walk_directory(category_path):
             try:
-                rel_path = str(file_path.relative_to(category_path))
+                # Strip the category prefix instead of Path.relative_to()
+                full_path = str(file_path)
+                rel_path = full_path[prefix_len:] if full_path.startswith(category_prefix) else str(file_path.relative_to(category_path))
                 metadata = get_file_metadata(file_path)
                 files_on_disk[rel_path] = metadata
             except Exception as e:
@@ -242,7 +274,7 @@ def scan_category(repo_path: Path, category: str, category_path: Path, changelog
                     # File exists in history - check if changed
                     if metadata["blake3"] != current_files[path]["hash"]:
                         # File content changed
-                        log_change(changelog, "changed", path, category, metadata)
+                        pending.append(build_change_entry("changed", path, category, metadata))
                         counts["changed"] += 1
                     else:
                         # File unchanged
@@ -253,7 +285,7 @@ def scan_category(repo_path: Path, category: str, category_path: Path, changelog
                     for old_path, old_info in list(current_files.items()):
                         if old_info["hash"] == metadata["blake3"] and old_path != path:
                             # Same file moved to new location
-                            log_change(changelog, "move", path, category, metadata, old_path=old_path)
+                            pending.append(build_change_entry("move", path, category, metadata, old_path=old_path))
                             current_files.pop(old_path)  # Remove old path
                             current_files[path] = {"hash": metadata["blake3"], "size": metadata["size"], "mtime": metadata["mtime"]}
                             counts["moved"] += 1
@@ -262,27 +294,38 @@ def scan_category(repo_path: Path, category: str, category_path: Path, changelog
                     
                     if not moved:
                         # Truly new file
-                        log_change(changelog, "new", path, category, metadata)
+                        pending.append(build_change_entry("new", path, category, metadata))
                         counts["new"] += 1
             except Exception as e:
                 logger.error(f"Error processing path {path}: {e}")
                 counts["error"] += 1
         
-        # Process deleted files
-        for path in list(current_files.keys()):
-            if path not in files_on_disk:
-                try:
-                    # File in history but not on disk - it's been deleted
-                    log_deletion(changelog, path, category, {"hash": current_files[path]["hash"]})
-                    counts["deleted"] += 1
-                except Exception as e:
-                    logger.error(f"Error processing deletion for {path}: {e}")
-                    counts["error"] += 1
+        # Process deleted files (in history but not on disk); the key view
+        # difference runs in C without copying the full path list
+        deleted_paths = sorted(current_files.keys() - files_on_disk.keys())
+        for path in deleted_paths:
+            try:
+                pending.append(build_deletion_entry(path, category, {"hash": current_files[path]["hash"]}))
+                counts["deleted"] += 1
+            except Exception as e:
+                logger.error(f"Error processing deletion for {path}: {e}")
+                counts["error"] += 1
     
     except Exception as e:
         logger.error(f"Error during scan of category {category}: {e}")
         counts["error"] += 1
     
+    # Write every detected change with a single locked append
+    try:
+        changelog.csv_manager.append_entries(current_changelog, pending)
+    except Exception as e:
+        logger.error(f"Error writing changes for category {category}: {e}")
+        # None of the pending changes were logged, so report them as errors
+        for entry in pending:
+            change_type = entry["transaction_type"]
+            counts["moved" if change_type == "move" else change_type] -= 1
+        counts["error"] += len(pending)
+    
     return counts
 
 def handle_scan_command(repo_path: str, category: Optional[str] = None) -> Dict[str, Dict[str, int]]:
@@ -304,7 +347,7 @@ def handle_scan_command(repo_path: str, category: Optional[str] = None) -> Dict[
     try:
         # Initialize config and changelog
         config = RepositoryConfig(str(repo_path))
-        changelog = Changelog(str(repo_path))
+        changelog = Changelog(str(repo_path), config=config)
     except (ConfigError, ChangelogError) as e:
         raise ScanError(f"Failed to initialize repository: {e}")
     
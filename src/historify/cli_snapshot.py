@@ -3,12 +3,15 @@
 Implementation of the snapshot command for historify.
 """
 import os
+import gzip
 import logging
 import tarfile
 import shutil
+import subprocess
+import tempfile
 import click
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime, UTC
 
 from historify.cli_verify import cli_verify_command
@@ -17,10 +20,131 @@ from historify.media_packer import pack_archives_for_media, MediaPackError
 
 logger = logging.getLogger(__name__)
 
+# Copy buffer for tarfile member data; tarfile's 16 KiB default means one
+# read/write pair per 16 KiB of every archived file
+TAR_COPY_BUFSIZE = 2 * 1024 * 1024
+
+# Whether each tar executable is GNU tar, keyed by its path
+_gnu_tar_cache: Dict[str, bool] = {}
+
 class SnapshotError(Exception):
     """Exception raised for snapshot-related errors."""
     pass
 
+def _compressor_command() -> Optional[List[str]]:
+    """
+    Find an external gzip compressor for the tar pipeline.
+    
+    Returns:
+        Command line for pigz (one thread per core) or gzip reading stdin and
+        writing stdout, or None if neither is installed.
+    """
+    pigz = shutil.which("pigz")
+    if pigz:
+        return [pigz, "-p", str(os.cpu_count() or 1), "-6"]
+    
+    gzip_tool = shutil.which("gzip")
+    if gzip_tool:
+        return [gzip_tool, "-6"]
+    
+    return None
+
+def _is_gnu_tar(tar_tool: str) -> bool:
+    """
+    Check whether a tar executable is GNU tar.
+    
+    Args:
+        tar_tool: Path to the tar executable.
+        
+    Returns:
+        True if `tar --version` identifies GNU tar.
+    """
+    is_gnu = _gnu_tar_cache.get(tar_tool)
+    if is_gnu is None:
+        try:
+            result = subprocess.run([tar_tool, "--version"], capture_output=True, text=True, check=False)
+            is_gnu = "GNU tar" in result.stdout
+        except OSError:
+            is_gnu = False
+        _gnu_tar_cache[tar_tool] = is_gnu
+    return is_gnu
+
+def write_tar_gz(source: Path, archive_path: Path) -> None:
+    """
+    Write a directory to a gzip-compressed tar archive rooted at its name.
+    
+    Streams `tar -cf -` through pigz (or gzip) when the tools are installed,
+    so archiving and compression run in native code and, with pigz, on all
+    cores. Falls back to the tarfile module otherwise, and when the archive
+    is written inside the source so that it can leave out its own output.
+    
+    Args:
+        source: Directory to archive.
+        archive_path: Path of the .tar.gz file to write.
+        
+    Raises:
+        SnapshotError: If the tar or compressor process fails.
+    """
+    tar_tool = shutil.which("tar")
+    compressor = _compressor_command() if tar_tool else None
+    archive_inside_source = archive_path.resolve().is_relative_to(source.resolve())
+    
+    if not compressor or archive_inside_source:
+        # Leave out the archive being written, which tar -cf - would include
+        own_member = None
+        if archive_inside_source:
+            own_member = (Path(source.name) / archive_path.resolve().relative_to(source.resolve())).as_posix()
+        
+        def skip_own_archive(member: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
+            return None if member.name == own_member else member
+        
+        # Stream mode writes members straight through to the compressor at
+        # the same level as the pipeline, without random-access buffering
+        with gzip.open(archive_path, "wb", compresslevel=6) as gz:
+            with tarfile.open(fileobj=gz, mode="w|", copybufsize=TAR_COPY_BUFSIZE) as tar:
+                tar.add(source, arcname=source.name, filter=skip_own_archive)
+        return
+    
+    is_gnu = _is_gnu_tar(tar_tool)
+    tar_cmd = [tar_tool, "-C", str(source.parent), "-cf", "-"]
+    if is_gnu:
+        # Store members in name order like tarfile.add(), so snapshots of
+        # the same tree stay byte-for-byte reproducible
+        tar_cmd.append("--sort=name")
+    # "--" keeps a source name starting with "-" from being read as an option
+    tar_cmd.extend(["--", source.name])
+    
+    # tar's stderr goes to a file so a chatty tar cannot block on a full pipe
+    # while we wait for the compressor
+    with open(archive_path, "wb") as out, tempfile.TemporaryFile() as tar_err:
+        tar = subprocess.Popen(tar_cmd, stdout=subprocess.PIPE, stderr=tar_err)
+        try:
+            gz = subprocess.Popen(compressor, stdin=tar.stdout, stdout=out, stderr=subprocess.PIPE)
+        except BaseException:
+            tar.kill()
+            tar.wait()
+            raise
+        finally:
+            # Only the compressor reads tar's output from here on
+            tar.stdout.close()
+        
+        _, gz_err = gz.communicate()
+        tar.wait()
+        
+        if tar.returncode != 0:
+            tar_err.seek(0)
+            message = tar_err.read().decode(errors="replace").strip()
+            # GNU tar exits with 1 when files changed while being read; the
+            # archive is still complete, as it was with tarfile. Other tars
+            # such as bsdtar use 1 for fatal errors.
+            if tar.returncode == 1 and is_gnu:
+                logger.warning(f"tar reported changes while archiving {source}: {message}")
+            else:
+                raise SnapshotError(f"tar failed for {source}: {message}")
+        if gz.returncode != 0:
+            message = gz_err.decode(errors="replace").strip()
+            raise SnapshotError(f"{Path(compressor[0]).name} failed for {source}: {message}")
+
 def create_snapshot(repo_path: str, output_path: str, base_filename: str, verify_first: bool = True, full: bool = False, media: Optional[str] = None) -> bool:
     """
     Create a compressed snapshot archive of the repository.
@@ -74,9 +198,7 @@ def create_snapshot(repo_path: str, output_path: str, base_filename: str, verify
             logger.info(f"Found {len(external_categories)} external categories")
         
         # Create the main repository archive
-        with tarfile.open(output_path, "w:gz") as tar:
-            # Add the entire repository directory
-            tar.add(repo_path, arcname=repo_path.name)
+        write_tar_gz(repo_path, output_path)
         
         logger.info(f"Created main snapshot at {output_path}")
         
@@ -96,9 +218,8 @@ def create_snapshot(repo_path: str, output_path: str, base_filename: str, verify
                 cat_archive_path = output_dir / f"{base_filename}-{cat_name}.tar.gz"
                 
                 try:
-                    with tarfile.open(cat_archive_path, "w:gz") as tar:
-                        # Add the external category directory with its actual name as the root
-                        tar.add(cat_path, arcname=cat_path.name)
+                    # Add the external category directory with its actual name as the root
+                    write_tar_gz(cat_path, cat_archive_path)
                     
                     logger.info(f"Created external category snapshot for '{cat_name}' at {cat_archive_path}")
                     created_category_archives.append(cat_archive_path)
@@ -11,7 +11,7 @@ from typing import Dict, List, Tuple, Optional, Set
 
 from historify.config import RepositoryConfig, ConfigError
 from historify.changelog import Changelog, ChangelogError
-from historify.minisign import minisign_verify, MinisignError
+from historify.minisign import minisign_verify, minisign_verify_many, MinisignError
 from historify.hash import hash_file, HashError
 from historify.csv_manager import CSVManager, CSVError
 
@@ -163,11 +163,19 @@ def rebuild_integrity_csv(repo_path: str) -> bool:
             logger.warning("No changelog files found to rebuild integrity.csv")
             return False
         
+        # Verify every signed changelog in one batch
+        signed_files = [f for f in changelog_files if f.with_suffix(".csv.minisig").exists()]
+        try:
+            verify_results = minisign_verify_many(signed_files, pubkey_path)
+        except MinisignError as e:
+            logger.error(f"Failed to verify changelog signatures: {e}")
+            verify_results = {}
+        
         # Process each changelog file
         for changelog_file in changelog_files:
             try:
                 # Get the hash of the file
-                hash_info = hash_file(changelog_file)
+                hash_info = hash_file(changelog_file, algorithms=["blake3"])
                 blake3_hash = hash_info.get("blake3", "")
                 
                 # Check if signature exists
@@ -179,13 +187,9 @@ def rebuild_integrity_csv(repo_path: str) -> bool:
                 verified_timestamp = ""
                 
                 if sig_exists:
-                    try:
-                        success, _ = minisign_verify(changelog_file, pubkey_path)
-                        verified = success
-                        if success:
-                            verified_timestamp = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC")
-                    except MinisignError:
-                        verified = False
+                    verified, _ = verify_results.get(changelog_file, (False, ""))
+                    if verified:
+                        verified_timestamp = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S UTC")
                 
                 # Update integrity info
                 csv_manager.update_integrity_info(
@@ -241,7 +245,7 @@ def verify_full_chain(repo_path: str) -> Tuple[bool, List[Dict[str, str]]]:
         
         # Initialize components
         config = RepositoryConfig(str(repo_path))
-        changelog = Changelog(str(repo_path))
+        changelog = Changelog(str(repo_path), config=config)
         
         # Get minisign public key
         pubkey_path = config.get("minisign.pub")
@@ -297,7 +301,7 @@ def verify_full_chain(repo_path: str) -> Tuple[bool, List[Dict[str, str]]]:
         
         # Get the hash of the seed file for the verification chain
         try:
-            seed_hash = hash_file(seed_file)["blake3"]
+            seed_hash = hash_file(seed_file, algorithms=["blake3"])["blake3"]
         except HashError as e:
             issues.append({
                 "file": str(seed_file),
@@ -391,7 +395,7 @@ def verify_full_chain(repo_path: str) -> Tuple[bool, List[Dict[str, str]]]:
                         referenced_file = repo_path / ref_path
                         if referenced_file.exists():
                             try:
-                                expected_hash = hash_file(referenced_file)["blake3"]
+                                expected_hash = hash_file(referenced_file, algorithms=["blake3"])["blake3"]
                             except HashError as e:
                                 issues.append({
                                     "file": str(changelog_file),
@@ -460,7 +464,7 @@ def verify_recent_logs(repo_path: str) -> Tuple[bool, List[Dict[str, str]]]:
         
         # Initialize components
         config = RepositoryConfig(str(repo_path))
-        changelog = Changelog(str(repo_path))
+        changelog = Changelog(str(repo_path), config=config)
         
         # Get minisign public key
         pubkey_path = config.get("minisign.pub")
@@ -521,7 +525,7 @@ def verify_recent_logs(repo_path: str) -> Tuple[bool, List[Dict[str, str]]]:
             if latest_signed:
                 # Get the hash of the latest signed changelog
                 try:
-                    latest_hash = hash_file(latest_signed)["blake3"]
+                    latest_hash = hash_file(latest_signed, algorithms=["blake3"])["blake3"]
                     
                     # Verify the current changelog's closing transaction
                     success, message = verify_changelog_hash_chain(current_changelog, latest_hash)
@@ -2,18 +2,297 @@
 Configuration module for historify that handles repository settings.
 """
 import os
+import re
 import logging
 import csv
-import configparser
+from itertools import chain
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, TextIO, Iterator
 
 logger = logging.getLogger(__name__)
 
+# "[section]" header line
+SECTION_RE = re.compile(r"^\[([^\]]+)\]\s*$")
+
+# "option = value" (or "option: value") line, split at the first delimiter
+OPTION_RE = re.compile(r"^([^=:;#\s][^=:]*?)\s*[=:]\s*(.*)$")
+
+# Parsed db/config files: path -> (stamp, parser)
+_config_cache: Dict[str, Tuple[Tuple[int, int, int], "FastConfigParser"]] = {}
+
+# Parsed config.csv files: path -> (stamp, {key: value})
+_config_csv_cache: Dict[str, Tuple[Tuple[int, int, int], Dict[str, str]]] = {}
+
 class ConfigError(Exception):
     """Exception raised for configuration-related errors."""
     pass
 
+class FastConfigParser:
+    """
+    Minimal INI parser for the repository's db/config file.
+    
+    The repository config only holds plain "option = value" lines grouped in
+    sections, so a single regex pass over the file replaces configparser.
+    Option names are lower-cased and values are taken literally, without
+    interpolation. write() emits the same layout as configparser.
+    """
+    
+    def __init__(self):
+        """Initialize an empty parser."""
+        self._sections: Dict[str, Dict[str, str]] = {}
+    
+    def read(self, file_path: Path) -> None:
+        """
+        Read and parse an INI file, merging it into the current sections.
+        
+        Args:
+            file_path: Path to the INI file.
+            
+        Raises:
+            ConfigError: If the file contains a line that can't be parsed.
+        """
+        with open(file_path, "r") as f:
+            self.read_string(f.read(), source=str(file_path))
+    
+    def read_string(self, text: str, source: str = "<string>") -> None:
+        """
+        Parse INI text, merging it into the current sections.
+        
+        Args:
+            text: INI content.
+            source: Name of the source used in error messages.
+            
+        Raises:
+            ConfigError: If a line can't be parsed.
+        """
+        section = None
+        option = None
+        
+        for lineno, line in enumerate(text.splitlines(), 1):
+            stripped = line.strip()
+            if not stripped or stripped[0] in "#;":
+                continue
+            
+            # Indented lines continue the previous value
+            if line[0].isspace() and option is not None:
+                section[option] += "\n" + stripped
+                continue
+            
+            match = SECTION_RE.match(stripped)
+            if match:
+                section = self._sections.setdefault(match.group(1), {})
+                option = None
+                continue
+            
+            match = OPTION_RE.match(stripped)
+            if match is None or section is None:
+                raise ConfigError(f"Invalid line {lineno} in {source}: {line!r}")
+            
+            option = match.group(1).lower()
+            section[option] = match.group(2)
+    
+    def write(self, file_handle: TextIO) -> None:
+        """
+        Write all sections in configparser's INI layout.
+        
+        Args:
+            file_handle: Open text file to write to.
+        """
+        chunks = []
+        for section, options in self._sections.items():
+            chunks.append(f"[{section}]\n")
+            for option, value in options.items():
+                value = value.replace("\n", "\n\t")
+                chunks.append(f"{option} = {value}\n")
+            chunks.append("\n")
+        file_handle.write("".join(chunks))
+    
+    def copy(self) -> "FastConfigParser":
+        """
+        Create an independent copy of this parser.
+        
+        Returns:
+            A new parser with the same sections and options.
+        """
+        parser = FastConfigParser()
+        parser._sections = {section: dict(options) for section, options in self._sections.items()}
+        return parser
+    
+    def sections(self) -> List[str]:
+        """
+        Get the section names.
+        
+        Returns:
+            List of section names in file order.
+        """
+        return list(self._sections)
+    
+    def has_option(self, section: str, option: str) -> bool:
+        """
+        Check whether an option exists.
+        
+        Args:
+            section: Section name.
+            option: Option name.
+            
+        Returns:
+            True if the option is set in the section.
+        """
+        return option.lower() in self._sections.get(section, ())
+    
+    def get(self, section: str, option: str, fallback: Optional[str] = None) -> Optional[str]:
+        """
+        Get an option value.
+        
+        Args:
+            section: Section name.
+            option: Option name.
+            fallback: Value returned if the option is not set.
+            
+        Returns:
+            The option value or fallback.
+        """
+        return self._sections.get(section, {}).get(option.lower(), fallback)
+    
+    def set(self, section: str, option: str, value: str) -> None:
+        """
+        Set an option value, creating the section if needed.
+        
+        Args:
+            section: Section name.
+            option: Option name.
+            value: Option value.
+        """
+        self._sections.setdefault(section, {})[option.lower()] = value
+    
+    def remove_option(self, section: str, option: str) -> bool:
+        """
+        Remove an option.
+        
+        Args:
+            section: Section name.
+            option: Option name.
+            
+        Returns:
+            True if the option existed.
+        """
+        return self._sections.get(section, {}).pop(option.lower(), None) is not None
+    
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """
+        Iterate over all options as "section.option" keys.
+        
+        Yields:
+            Tuples of ("section.option", value) in file order.
+        """
+        for section, options in self._sections.items():
+            for option, value in options.items():
+                yield f"{section}.{option}", value
+
+def _file_stamp(file_path: Path) -> Optional[Tuple[int, int, int]]:
+    """
+    Get a stamp identifying the current contents of a file.
+    
+    Args:
+        file_path: Path to the file.
+        
+    Returns:
+        Tuple of (inode, mtime in ns, size), or None if the file doesn't exist.
+    """
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+def _load_config(config_file: Path) -> FastConfigParser:
+    """
+    Get the parsed INI configuration, reusing the cached parse if the file
+    hasn't changed.
+    
+    Args:
+        config_file: Path to the db/config file.
+        
+    Returns:
+        A parser the caller may modify.
+    """
+    key = str(config_file)
+    stamp = _file_stamp(config_file)
+    if stamp is None:
+        _config_cache.pop(key, None)
+        return FastConfigParser()
+    
+    cached = _config_cache.get(key)
+    if cached is None or cached[0] != stamp:
+        parser = FastConfigParser()
+        parser.read(config_file)
+        cached = (stamp, parser)
+        _config_cache[key] = cached
+    
+    return cached[1].copy()
+
+def read_csv_rows(csv_path: Path) -> Iterator[Tuple[str, str]]:
+    """
+    Lazily read the rows of a key/value CSV file.
+    
+    Rows are read as plain lists and the key and value columns are picked by
+    their position in the header, so no dictionary is built per row.
+    
+    Args:
+        csv_path: Path to the CSV file.
+        
+    Yields:
+        One (key, value) tuple per row.
+    """
+    with open(csv_path, "r", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        key_index = header.index("key")
+        value_index = header.index("value")
+        for row in reader:
+            yield row[key_index], row[value_index]
+
+def _load_config_csv(config_csv: Path) -> Dict[str, str]:
+    """
+    Get the values stored in config.csv, reusing the cached read if the file
+    hasn't changed.
+    
+    Args:
+        config_csv: Path to the config.csv file.
+        
+    Returns:
+        Dictionary of key-value pairs; the first row wins for repeated keys.
+        The dictionary is shared and must not be modified.
+    """
+    cache_key = str(config_csv)
+    stamp = _file_stamp(config_csv)
+    if stamp is None:
+        _config_csv_cache.pop(cache_key, None)
+        return {}
+    
+    cached = _config_csv_cache.get(cache_key)
+    if cached is None or cached[0] != stamp:
+        values = {}
+        for key, value in read_csv_rows(config_csv):
+            values.setdefault(key, value)
+        cached = (stamp, values)
+        _config_csv_cache[cache_key] = cached
+    
+    return cached[1]
+
+def _invalidate_config_cache(*paths: Path) -> None:
+    """
+    Drop cached parses of the given files.
+    
+    Args:
+        *paths: Config files that were just written.
+    """
+    for path in paths:
+        _config_cache.pop(str(path), None)
+        _config_csv_cache.pop(str(path), None)
+
 class RepositoryConfig:
     """Manages historify repository configuration."""
     
@@ -27,7 +306,7 @@ class RepositoryConfig:
         Raises:
             ConfigError: If the repository is not properly initialized.
         """
-        self.repo_path = Path(repo_path).resolve()
+        self.repo_path = Path(os.path.abspath(repo_path))
         self.db_dir = self.repo_path / "db"
         self.config_file = self.db_dir / "config"
         self.config_csv = self.db_dir / "config.csv"
@@ -37,13 +316,11 @@ class RepositoryConfig:
             raise ConfigError(f"Not a valid historify repository: {self.repo_path}")
         
         # Load configuration
-        self.config = configparser.ConfigParser()
-        if self.config_file.exists():
-            self.config.read(self.config_file)
+        self.config = _load_config(self.config_file)
         
         # Ensure config.csv exists
         if not self.config_csv.exists():
-            self._initialize_config_csv()
+            self.export_csv()
     
     def _is_valid_repository(self) -> bool:
         """
@@ -57,28 +334,43 @@ class RepositoryConfig:
             self.config_file.exists()
         )
     
-    def _initialize_config_csv(self) -> None:
+    def export_csv(self) -> bool:
         """
-        Initialize the config.csv file with header.
+        Write config.csv as a view of the current configuration.
+        
+        The INI file is authoritative; set() only updates it, and config.csv
+        is regenerated here at transaction boundaries. Keys that exist only
+        in config.csv are kept.
         
+        Returns:
+            True if config.csv was written successfully.
+            
         Raises:
-            ConfigError: If initialization fails.
+            ConfigError: If writing fails.
         """
         try:
-            with open(self.config_csv, "w", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=["key", "value"])
-                writer.writeheader()
-                
-                # Write existing config from INI file
-                for section in self.config.sections():
-                    for option in self.config[section]:
-                        key = f"{section}.{option}"
-                        value = self.config[section][option]
-                        writer.writerow({"key": key, "value": value})
-                        
+            # Include CSV-only keys after the INI values; the CSV is loaded
+            # here, before the file is truncated, and filtered while writing
+            ini_values = dict(self.config.items())
+            csv_only = (
+                (key, value) for key, value in _load_config_csv(self.config_csv).items()
+                if key not in ini_values
+            )
+            
+            # Write to a sibling file and swap it in, so readers never see a
+            # truncated config.csv
+            tmp_csv = self.config_csv.with_name(self.config_csv.name + ".tmp")
+            try:
+                with open(tmp_csv, "w", newline="") as f:
+                    csv.writer(f).writerows(chain([("key", "value")], ini_values.items(), csv_only))
+                os.replace(tmp_csv, self.config_csv)
+            finally:
+                _invalidate_config_cache(self.config_csv)
+            
+            return True
         except Exception as e:
-            logger.error(f"Failed to initialize config.csv: {e}")
-            raise ConfigError(f"Failed to initialize config.csv: {e}")
+            logger.error(f"Failed to export config.csv: {e}")
+            raise ConfigError(f"Failed to export config.csv: {e}")
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -101,17 +393,13 @@ class RepositoryConfig:
         section, option = parts
         
         # First try from INI file
-        if section in self.config and option in self.config[section]:
-            return self.config[section][option]
+        value = self.config.get(section, option)
+        if value is not None:
+            return value
         
         # Then try from CSV file
         try:
-            if self.config_csv.exists():
-                with open(self.config_csv, "r", newline="") as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        if row["key"] == key:
-                            return row["value"]
+            return _load_config_csv(self.config_csv).get(key, default)
         except Exception as e:
             logger.error(f"Error reading config.csv: {e}")
         
@@ -156,43 +444,19 @@ class RepositoryConfig:
                 # Continue anyway, setting the config is still useful
         
         # Update INI file
-        if section not in self.config:
-            self.config[section] = {}
-        
-        self.config[section][option] = value
+        self.config.set(section, option, value)
         
         try:
             with open(self.config_file, "w") as f:
                 self.config.write(f)
         except OSError as e:
             raise ConfigError(f"Failed to write config file: {e}")
+        finally:
+            _invalidate_config_cache(self.config_file)
         
-        # Update CSV file
-        try:
-            # Read existing entries
-            entries = []
-            
-            if self.config_csv.exists():
-                with open(self.config_csv, "r", newline="") as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        if row["key"] != key:
-                            entries.append(row)
-            
-            # Add new entry
-            entries.append({"key": key, "value": value})
-            
-            # Write updated entries
-            with open(self.config_csv, "w", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=["key", "value"])
-                writer.writeheader()
-                writer.writerows(entries)
-            
-            logger.info(f"Set configuration {key} = {value}")
-            return True
-            
-        except Exception as e:
-            raise ConfigError(f"Failed to update config.csv: {e}")
+        # config.csv is regenerated by export_csv() at transaction boundaries
+        logger.info(f"Set configuration {key} = {value}")
+        return True
     
     def check(self) -> List[Tuple[str, str]]:
         """
@@ -203,49 +467,28 @@ class RepositoryConfig:
         """
         issues = []
         
+        # Merge both storage locations once; INI values take precedence
+        values = self.list_all()
+        
         # Required configurations to check
         required_configs = {
             "repository.name": "Repository name is not set",
             "hash.algorithms": "Hash algorithms not configured (should include at least blake3)"
         }
         
-        # Check required configurations - test both storage locations
+        # If missing from both locations, it's an issue
         for key, issue in required_configs.items():
-            # Split the key into section and option
-            parts = key.split(".", 1)
-            if len(parts) != 2:
-                continue
-                
-            section, option = parts
-            
-            # Check if it exists in the INI file
-            ini_exists = section in self.config and option in self.config[section]
-            
-            # Check if it exists in the CSV file
-            csv_exists = False
-            try:
-                if self.config_csv.exists():
-                    with open(self.config_csv, "r", newline="") as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            if row["key"] == key:
-                                csv_exists = True
-                                break
-            except Exception:
-                csv_exists = False
-            
-            # If missing from both locations, it's an issue
-            if not ini_exists and not csv_exists:
+            if key not in values:
                 issues.append((key, issue))
         
         # Check hash algorithms
-        hash_algorithms = self.get("hash.algorithms", "")
+        hash_algorithms = values.get("hash.algorithms", "")
         if hash_algorithms and "blake3" not in hash_algorithms.lower().split(","):
             issues.append(("hash.algorithms", "blake3 must be included in hash algorithms"))
         
         # Check minisign key if specified
-        minisign_key = self.get("minisign.key")
-        minisign_pub = self.get("minisign.pub")
+        minisign_key = values.get("minisign.key")
+        minisign_pub = values.get("minisign.pub")
         
         if minisign_key and not Path(minisign_key).exists():
             issues.append(("minisign.key", f"Minisign key file not found: {minisign_key}"))
@@ -268,19 +511,13 @@ class RepositoryConfig:
         config_values = {}
         
         # Get values from INI file
-        for section in self.config.sections():
-            for option in self.config[section]:
-                key = f"{section}.{option}"
-                config_values[key] = self.config[section][option]
+        config_values.update(self.config.items())
         
         # Get values from CSV file
         try:
-            if self.config_csv.exists():
-                with open(self.config_csv, "r", newline="") as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        if row["key"] not in config_values:  # Prefer INI file values
-                            config_values[row["key"]] = row["value"]
+            for key, value in _load_config_csv(self.config_csv).items():
+                if key not in config_values:  # Prefer INI file values
+                    config_values[key] = value
         except Exception as e:
             logger.error(f"Error reading config.csv: {e}")
         
@@ -12,10 +12,30 @@ import tempfile
 import shutil
 from pathlib import Path
 from datetime import datetime, UTC
-from typing import Dict, List, Optional, Any, TextIO
+from typing import Dict, Iterable, List, Optional, Any, TextIO, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Column layout of changelog files
+CHANGELOG_FIELDS = (
+    "timestamp",
+    "transaction_type",
+    "path",
+    "category",
+    "size",
+    "ctime",
+    "mtime",
+    "sha256",
+    "blake3"
+)
+
+# Column layout of db/integrity.csv
+INTEGRITY_FIELDS = ("changelog_file", "blake3", "signature_file", "verified", "verified_timestamp")
+
+# Header lines as csv.writer would emit them, built once at import time
+CHANGELOG_HEADER = ",".join(CHANGELOG_FIELDS) + "\r\n"
+INTEGRITY_HEADER = ",".join(INTEGRITY_FIELDS) + "\r\n"
+
 class CSVError(Exception):
     """Exception raised for CSV-related errors."""
     pass
@@ -30,18 +50,15 @@ class CSVManager:
         Args:
             repo_path: Path to the repository.
         """
-        self.repo_path = Path(repo_path).resolve()
-        self.required_fields = [
-            "timestamp",
-            "transaction_type",
-            "path",
-            "category",
-            "size",
-            "ctime",
-            "mtime",
-            "sha256",
-            "blake3"
-        ]
+        self.repo_path = Path(os.path.abspath(repo_path))
+        self.required_fields = list(CHANGELOG_FIELDS)
+        # Header of each CSV file already known to exist, so repeated
+        # appends skip the existence check and header read
+        self._known_fieldnames: Dict[Path, List[str]] = {}
+        # integrity.csv rows keyed by changelog file name, together with the
+        # (inode, mtime, size) of the file they were read from
+        self._integrity_index: Optional[Dict[str, Dict[str, str]]] = None
+        self._integrity_stamp: Optional[Tuple[int, int, int]] = None
         
     def _lock_file(self, file_handle: TextIO) -> None:
         """
@@ -106,8 +123,7 @@ class CSVManager:
             with open(file_path, "r", newline="") as f:
                 self._lock_file(f)
                 try:
-                    reader = csv.DictReader(f)
-                    return reader.fieldnames or self.required_fields
+                    return next(csv.reader(f), None) or self.required_fields
                 finally:
                     self._unlock_file(f)
         except Exception as e:
@@ -138,15 +154,26 @@ class CSVManager:
             with open(file_path, "r", newline="") as f:
                 self._lock_file(f)
                 try:
-                    reader = csv.DictReader(f)
-                    if reader.fieldnames is None:
+                    reader = csv.reader(f)
+                    fieldnames = next(reader, None)
+                    if fieldnames is None:
                         return []
                     
+                    field_count = len(fieldnames)
+                    category_idx = fieldnames.index("category") if "category" in fieldnames else None
+                    
                     for row in reader:
+                        # Skip blank lines, as DictReader did
+                        if not row:
+                            continue
+                        # Pad short rows so missing fields read as None
+                        if len(row) < field_count:
+                            row.extend([None] * (field_count - len(row)))
                         # Apply category filter if specified
-                        if category and (not row.get("category") or row["category"] != category):
+                        if category and (category_idx is None or row[category_idx] != category):
                             continue
-                        entries.append(row)
+                        # Build the dict only at the API boundary
+                        entries.append(dict(zip(fieldnames, row)))
                 finally:
                     self._unlock_file(f)
                     
@@ -170,22 +197,49 @@ class CSVManager:
         Raises:
             CSVError: If appending fails.
         """
-        if not file_path.exists():
+        self.append_entries(file_path, (entry,))
+        return True
+    
+    def append_entries(self, file_path: Path, entries: Iterable[Dict[str, str]]) -> int:
+        """
+        Append several entries to a CSV file under a single lock.
+        
+        The file is opened once and all rows are handed to the csv writer in
+        one writerows() call.
+        
+        Args:
+            file_path: Path to the CSV file.
+            entries: Entry dictionaries to append, in order.
+            
+        Returns:
+            Number of entries appended.
+            
+        Raises:
+            CSVError: If appending fails.
+        """
+        fieldnames = self._known_fieldnames.get(file_path)
+        if fieldnames is None and not file_path.exists():
             raise CSVError(f"CSV file does not exist: {file_path}")
             
         try:
-            # Get the fieldnames from the file
-            fieldnames = self._get_fieldnames(file_path)
+            # Get the fieldnames from the file on first append
+            if fieldnames is None:
+                fieldnames = self._get_fieldnames(file_path)
+                self._known_fieldnames[file_path] = fieldnames
+            
+            # Lay rows out positionally in the file's field order
+            rows = [[entry.get(name, "") for name in fieldnames] for entry in entries]
+            if not rows:
+                return 0
             
             with open(file_path, "a", newline="") as f:
                 self._lock_file(f)
                 try:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writerow(entry)
+                    csv.writer(f).writerows(rows)
                 finally:
                     self._unlock_file(f)
                     
-            return True
+            return len(rows)
             
         except Exception as e:
             logger.error(f"Error appending to CSV file: {e}")
@@ -214,11 +268,11 @@ class CSVManager:
             with open(file_path, "w", newline="") as f:
                 self._lock_file(f)
                 try:
-                    writer = csv.DictWriter(f, fieldnames=self.required_fields)
-                    writer.writeheader()
+                    f.write(CHANGELOG_HEADER)
                 finally:
                     self._unlock_file(f)
-                    
+            
+            self._known_fieldnames[file_path] = list(self.required_fields)
             return True
             
         except Exception as e:
@@ -317,6 +371,38 @@ class CSVManager:
                 except Exception as e:
                     logger.warning(f"Failed to remove temp file {temp_file}: {e}")
     
+    def _load_integrity_index(self, integrity_file: Path) -> Dict[str, Dict[str, str]]:
+        """
+        Get integrity.csv rows keyed by changelog file name.
+        
+        The index is cached and only rebuilt when the file changes on disk.
+        
+        Args:
+            integrity_file: Path to the integrity.csv file.
+            
+        Returns:
+            Dictionary mapping changelog file names to their integrity entries.
+            
+        Raises:
+            CSVError: If reading fails.
+        """
+        try:
+            st = os.stat(integrity_file)
+        except FileNotFoundError:
+            self._integrity_index = None
+            self._integrity_stamp = None
+            return {}
+        
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if self._integrity_index is None or self._integrity_stamp != stamp:
+            self._integrity_index = {
+                entry.get("changelog_file"): entry
+                for entry in self.read_entries(integrity_file)
+            }
+            self._integrity_stamp = stamp
+        
+        return self._integrity_index
+    
     def get_integrity_info(self, changelog_file: str) -> Optional[Dict[str, str]]:
         """
         Get integrity information for a changelog file from the integrity.csv file.
@@ -329,18 +415,8 @@ class CSVManager:
         """
         integrity_file = self.repo_path / "db" / "integrity.csv"
         
-        if not integrity_file.exists():
-            return None
-            
         try:
-            entries = self.read_entries(integrity_file)
-            
-            for entry in entries:
-                if entry.get("changelog_file") == changelog_file:
-                    return entry
-                    
-            return None
-            
+            return self._load_integrity_index(integrity_file).get(changelog_file)
         except Exception as e:
             logger.error(f"Error reading integrity file: {e}")
             return None
@@ -364,8 +440,6 @@ class CSVManager:
         
         # Create integrity file if it doesn't exist
         if not integrity_file.exists():
-            integrity_fields = ["changelog_file", "blake3", "signature_file", "verified", "verified_timestamp"]
-            
             try:
                 # Create parent directory if it doesn't exist
                 integrity_file.parent.mkdir(parents=True, exist_ok=True)
@@ -373,8 +447,7 @@ class CSVManager:
                 with open(integrity_file, "w", newline="") as f:
                     self._lock_file(f)
                     try:
-                        writer = csv.DictWriter(f, fieldnames=integrity_fields)
-                        writer.writeheader()
+                        f.write(INTEGRITY_HEADER)
                     finally:
                         self._unlock_file(f)
                         
@@ -384,16 +457,14 @@ class CSVManager:
         
         # Read existing entries
         try:
-            entries = []
+            try:
+                index = self._load_integrity_index(integrity_file)
+            except CSVError:
+                # If there's an error reading, we'll just use an empty index
+                index = {}
             
-            if integrity_file.exists():
-                try:
-                    entries = self.read_entries(integrity_file)
-                    # Filter out the entry we're updating
-                    entries = [entry for entry in entries if entry.get("changelog_file") != changelog_file]
-                except CSVError:
-                    # If there's an error reading, we'll just use an empty list
-                    entries = []
+            # Drop the entry we're updating so the new one goes last
+            index.pop(changelog_file, None)
             
             # Add new entry
             new_entry = {
@@ -404,7 +475,7 @@ class CSVManager:
                 "verified_timestamp": verified_timestamp
             }
             
-            entries.append(new_entry)
+            index[changelog_file] = new_entry
             
             # Get fieldnames
             fieldnames = list(new_entry.keys())
@@ -415,12 +486,21 @@ class CSVManager:
                 try:
                     writer = csv.DictWriter(f, fieldnames=fieldnames)
                     writer.writeheader()
-                    writer.writerows(entries)
+                    writer.writerows(index.values())
                 finally:
                     self._unlock_file(f)
+            
+            # Keep the index for the next lookup unless the file vanished
+            try:
+                st = os.stat(integrity_file)
+                self._integrity_index = index
+                self._integrity_stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+            except OSError:
+                self._integrity_index = None
                     
             return True
             
         except Exception as e:
+            self._integrity_index = None
             logger.error(f"Error updating integrity file: {e}")
             return False
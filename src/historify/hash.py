@@ -1,18 +1,71 @@
 """
 Hash module for historify providing hash functionality.
 """
+import os
+import stat
+import hashlib
 import subprocess
 import logging
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Union, Optional, List, Dict
+from typing import Union, Optional, List, Dict, Tuple
+
+import blake3 as _blake3
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Files smaller than this are read in chunks instead of memory-mapped
+BLAKE3_MMAP_THRESHOLD = 16 * 1024
+
+# Read buffer size for chunked Blake3 hashing (1 MiB)
+BLAKE3_READ_BUF = 1 << 20
+
+# Files at least this large are hashed with Blake3's internal multithreading;
+# below it the thread overhead outweighs the gain
+BLAKE3_MT_THRESHOLD = 1 << 20
+
 class HashError(Exception):
     """Custom exception for hash-related errors."""
     pass
 
+def _update_blake3_chunked(hasher, file_path: Path) -> None:
+    """
+    Feed a file into a Blake3 hasher with a chunked read loop.
+    
+    Args:
+        hasher: Blake3 hasher object.
+        file_path: Path to the file.
+    """
+    buf = bytearray(BLAKE3_READ_BUF)
+    view = memoryview(buf)
+    # The read buffer already matches the chunk size, so read straight into
+    # it from the raw file instead of through a second 8 KiB buffer
+    with open(file_path, "rb", buffering=0) as f:
+        # Reuse one buffer for every chunk and pass only the filled slice
+        while n := f.readinto(buf):
+            hasher.update(view[:n])
+
+def _update_blake3_mmap(hasher, file_path: Path) -> None:
+    """
+    Feed a file into a Blake3 hasher through a memory map.
+    
+    Uses the native update_mmap() when the blake3 module provides it
+    (blake3-py >= 0.4), otherwise maps the file manually.
+    
+    Args:
+        hasher: Blake3 hasher object.
+        file_path: Path to the file.
+    """
+    if hasattr(hasher, "update_mmap"):
+        hasher.update_mmap(file_path)
+        return
+    
+    with open(file_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            hasher.update(mm)
+
 def get_blake3_hash_native(file_path: Union[str, Path]) -> str:
     """
     Compute the Blake3 hash of a file using the native Python implementation.
@@ -25,79 +78,109 @@ def get_blake3_hash_native(file_path: Union[str, Path]) -> str:
         
     Raises:
         HashError: If the file doesn't exist or can't be read.
-        ImportError: If the blake3 module is not available.
     """
-    try:
-        import blake3
-    except ImportError:
-        raise ImportError("Native blake3 module not available. Install with 'pip install blake3'.")
-    
     file_path = Path(file_path)
     if not file_path.is_file():
         raise HashError(f"File does not exist: {file_path}")
 
     try:
-        hasher = blake3.blake3()
-        with open(file_path, "rb") as f:
-            # Read in chunks to handle large files efficiently
-            chunk = f.read(8192)
-            while chunk:
-                hasher.update(chunk)
-                chunk = f.read(8192)
+        size = file_path.stat().st_size
+        if size >= BLAKE3_MT_THRESHOLD:
+            hasher = _blake3.blake3(max_threads=_blake3.blake3.AUTO)
+        else:
+            hasher = _blake3.blake3()
+        
+        if size < BLAKE3_MMAP_THRESHOLD:
+            _update_blake3_chunked(hasher, file_path)
+        else:
+            _update_blake3_mmap(hasher, file_path)
         
         return hasher.hexdigest()
     except (IOError, OSError) as e:
         raise HashError(f"Failed to read file {file_path}: {e}")
 
-def get_blake3_hash(file_path: Union[str, Path], tool_path: str = "b3sum", use_native: bool = True) -> str:
+def get_blake3_hash(file_path: Union[str, Path]) -> str:
     """
-    Compute the Blake3 hash of a file. Prefers native implementation if available.
+    Compute the Blake3 hash of a file.
     
     Args:
         file_path: Path to the file.
-        tool_path: Path to the b3sum binary (default: "b3sum").
-        use_native: Whether to prefer the native Python implementation.
         
     Returns:
         The Blake3 hash as a lowercase hexadecimal string.
         
     Raises:
-        HashError: If the tool fails, file doesn't exist, or command errors.
+        HashError: If the file doesn't exist or can't be read.
+    """
+    return get_blake3_hash_native(file_path)
+
+def get_blake3_hashes_many(file_paths: List[Union[str, Path]], workers: Optional[int] = None) -> Dict[Union[str, Path], str]:
+    """
+    Compute the Blake3 hashes of many files in parallel.
+    
+    Threads are sufficient here: the native blake3 module releases the GIL
+    while hashing.
+    
+    Args:
+        file_paths: Paths to the files.
+        workers: Number of worker threads (default: os.cpu_count()).
+        
+    Returns:
+        Dictionary mapping each given path to its Blake3 hash.
+        
+    Raises:
+        HashError: If hashing any of the files fails.
+    """
+    if not file_paths:
+        return {}
+    
+    workers = min(workers or os.cpu_count() or 1, len(file_paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(file_paths, executor.map(get_blake3_hash, file_paths)))
+
+def get_sha256_hash_native(file_path: Union[str, Path]) -> str:
+    """
+    Compute the SHA256 hash of a file in-process using hashlib.
+    
+    Uses hashlib.file_digest() where available (Python 3.11+), which hashes
+    in an optimized loop outside the GIL; otherwise reads the file through a
+    reusable buffer.
+    
+    Args:
+        file_path: Path to the file.
+        
+    Returns:
+        The SHA256 hash as a lowercase hexadecimal string.
+        
+    Raises:
+        HashError: If the file doesn't exist or can't be read.
     """
-    # Try native implementation first if requested
-    if use_native:
-        try:
-            return get_blake3_hash_native(file_path)
-        except ImportError:
-            logger.warning("Native blake3 module not available, falling back to command-line tool.")
-        except Exception as e:
-            logger.warning(f"Native Blake3 implementation failed: {e}. Falling back to tool.")
-    
-    # Fall back to command-line tool
     file_path = Path(file_path)
     if not file_path.is_file():
         raise HashError(f"File does not exist: {file_path}")
-
+    
     try:
-        result = subprocess.run(
-            [tool_path, "--no-names", str(file_path)],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip()
-    except FileNotFoundError:
-        raise HashError(f"Blake3 tool not found: {tool_path}")
-    except subprocess.CalledProcessError as e:
-        raise HashError(f"Failed to compute Blake3 hash: {e.stderr}")
+        with open(file_path, "rb", buffering=0) as f:
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            
+            hasher = hashlib.sha256()
+            buf = bytearray(BLAKE3_READ_BUF)
+            view = memoryview(buf)
+            while n := f.readinto(buf):
+                hasher.update(view[:n])
+            return hasher.hexdigest()
+    except OSError as e:
+        raise HashError(f"Failed to compute SHA256 hash: {e}")
 
-def get_sha256_hash(file_path: Union[str, Path], tool_path: str = "sha256sum") -> str:
+def get_sha256_hash(file_path: Union[str, Path], tool_path: str = "sha256sum", use_native: bool = True) -> str:
     """
-    Compute the SHA256 hash of a file.
+    Compute the SHA256 hash of a file. Prefers native implementation.
     
     Args:
         file_path: Path to the file.
         tool_path: Path to the sha256sum binary (default: "sha256sum").
+        use_native: Whether to prefer the in-process hashlib implementation.
         
     Returns:
         The SHA256 hash as a lowercase hexadecimal string.
@@ -105,6 +188,9 @@ def get_sha256_hash(file_path: Union[str, Path], tool_path: str = "sha256sum") -
     Raises:
         HashError: If the tool fails, file doesn't exist, or command errors.
     """
+    if use_native:
+        return get_sha256_hash_native(file_path)
+    
     file_path = Path(file_path)
     if not file_path.is_file():
         raise HashError(f"File does not exist: {file_path}")
@@ -124,6 +210,49 @@ def get_sha256_hash(file_path: Union[str, Path], tool_path: str = "sha256sum") -
         error_msg = getattr(e, 'stderr', str(e))
         raise HashError(f"Failed to compute SHA256 hash: {error_msg}")
 
+def scan_file(file_path: Union[str, Path]) -> Tuple[os.stat_result, Dict[str, str]]:
+    """
+    Stat a file and compute its Blake3 and SHA256 hashes in a single pass.
+    
+    The file is stat'ed once and read once, with both hashers fed from the
+    same buffer.
+    
+    Args:
+        file_path: Path to the file.
+        
+    Returns:
+        Tuple of (stat result, dictionary of algorithm names to hash values).
+        
+    Raises:
+        HashError: If the file doesn't exist, isn't a regular file or can't be read.
+    """
+    file_path = Path(file_path)
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        raise HashError(f"File does not exist: {file_path}")
+    
+    if st.st_size >= BLAKE3_MT_THRESHOLD:
+        b3 = _blake3.blake3(max_threads=_blake3.blake3.AUTO)
+    else:
+        b3 = _blake3.blake3()
+    sha = hashlib.sha256()
+    
+    buf = bytearray(BLAKE3_READ_BUF)
+    view = memoryview(buf)
+    try:
+        with open(file_path, "rb", buffering=0) as f:
+            while n := f.readinto(buf):
+                chunk = view[:n]
+                b3.update(chunk)
+                sha.update(chunk)
+    except OSError as e:
+        raise HashError(f"Failed to read file {file_path}: {e}")
+    
+    return st, {"blake3": b3.hexdigest(), "sha256": sha.hexdigest()}
+
 def hash_file(file_path: Union[str, Path], algorithms: List[str] = None) -> Dict[str, str]:
     """
     Compute multiple hashes for a file based on specified algorithms.
@@ -145,6 +274,10 @@ def hash_file(file_path: Union[str, Path], algorithms: List[str] = None) -> Dict
     if not file_path.is_file():
         raise HashError(f"File does not exist: {file_path}")
     
+    # Compute both default hashes in one read
+    if sorted(a.lower() for a in algorithms) == ["blake3", "sha256"]:
+        return scan_file(file_path)[1]
+    
     result = {}
     for algorithm in algorithms:
         if algorithm.lower() == "blake3":
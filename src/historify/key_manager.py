@@ -9,10 +9,16 @@ import re
 import base64
 import binascii
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Key ID following "public key" in a minisign public key comment line
+_KEY_ID_RE = re.compile(r"public key\s+([0-9A-F]{16})")
+
+# Cache of keys directory listings: keys_dir -> (stamp, {stem: path})
+_keys_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Path]]] = {}
+
 class KeyError(Exception):
     """Exception raised for key-related errors."""
     pass
@@ -53,7 +59,7 @@ def extract_key_id_from_comment(comment_line: str) -> Optional[str]:
         The key ID as a string, or None if extraction fails.
     """
     # Try to match the key ID after "public key" in the comment
-    match = re.search(r"public key\s+([0-9A-F]{16})", comment_line)
+    match = _KEY_ID_RE.search(comment_line)
     if match:
         return match.group(1)
     return None
@@ -73,6 +79,7 @@ def backup_public_key(repo_path: str, public_key_path: str) -> Optional[str]:
         KeyError: If the backup fails.
     """
     try:
+        cache_key = _keys_dir(repo_path)
         repo_path = Path(repo_path).resolve()
         public_key_path = Path(public_key_path).resolve()
         
@@ -127,12 +134,65 @@ def backup_public_key(repo_path: str, public_key_path: str) -> Optional[str]:
         shutil.copy2(public_key_path, target_path)
         logger.info(f"Backed up public key {key_id} to {target_path}")
         
+        # The cache stamp is the directory mtime, which may not move on
+        # filesystems with coarse timestamps
+        _keys_cache.pop(cache_key, None)
+        _keys_cache.pop(str(keys_dir), None)
+        
         return key_id
         
     except Exception as e:
         logger.error(f"Failed to backup public key: {e}")
         raise KeyError(f"Failed to backup public key: {e}")
 
+def _keys_dir(repo_path: str) -> str:
+    """
+    Get the absolute path of the repository's keys directory.
+    
+    Uses os.path.abspath rather than Path.resolve() to avoid a realpath
+    syscall chain on every lookup.
+    
+    Args:
+        repo_path: Path to the repository.
+        
+    Returns:
+        Absolute path to the keys directory.
+    """
+    return os.path.join(os.path.abspath(repo_path), "db", "keys")
+
+def _load_keys_cache(keys_dir: str) -> Dict[str, Path]:
+    """
+    Get the public keys in a keys directory, keyed by file stem.
+    
+    The directory is only rescanned when its inode or mtime changes.
+    
+    Args:
+        keys_dir: Path to the keys directory.
+        
+    Returns:
+        Dictionary mapping key IDs (file stems) to key file paths.
+        Empty if the directory does not exist.
+    """
+    try:
+        st = os.stat(keys_dir)
+    except FileNotFoundError:
+        _keys_cache.pop(keys_dir, None)
+        return {}
+    
+    stamp = (st.st_ino, st.st_mtime_ns)
+    cached = _keys_cache.get(keys_dir)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    
+    keys = {}
+    with os.scandir(keys_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".pub") and entry.is_file():
+                keys[entry.name[:-len(".pub")]] = Path(entry.path)
+    
+    _keys_cache[keys_dir] = (stamp, keys)
+    return keys
+
 def find_public_key_by_id(repo_path: str, key_id: str) -> Optional[Path]:
     """
     Find a public key by its ID in the repository's keys directory.
@@ -145,20 +205,16 @@ def find_public_key_by_id(repo_path: str, key_id: str) -> Optional[Path]:
         Path to the public key file if found, None otherwise.
     """
     try:
-        repo_path = Path(repo_path).resolve()
-        keys_dir = repo_path / "db" / "keys"
-        
-        if not keys_dir.exists():
-            return None
+        keys = _load_keys_cache(_keys_dir(repo_path))
         
         # Look for exact match first
-        key_file = keys_dir / f"{key_id}.pub"
-        if key_file.exists():
+        key_file = keys.get(key_id)
+        if key_file is not None:
             return key_file
         
         # If not found, try to find a key that contains the ID in its name
-        for key_file in keys_dir.glob("*.pub"):
-            if key_id in key_file.stem:
+        for stem, key_file in keys.items():
+            if key_id in stem:
                 return key_file
         
         return None
@@ -178,20 +234,12 @@ def list_backed_up_keys(repo_path: str) -> List[Dict[str, str]]:
         List of dictionaries with key info (id, path).
     """
     try:
-        repo_path = Path(repo_path).resolve()
-        keys_dir = repo_path / "db" / "keys"
-        
-        if not keys_dir.exists():
-            return []
-        
-        keys = []
-        for key_file in keys_dir.glob("*.pub"):
-            keys.append({
-                "id": key_file.stem,
-                "path": str(key_file)
-            })
+        keys = _load_keys_cache(_keys_dir(repo_path))
         
-        return keys
+        return [
+            {"id": stem, "path": str(key_file)}
+            for stem, key_file in keys.items()
+        ]
         
     except Exception as e:
         logger.error(f"Error listing backed up keys: {e}")
@@ -6,8 +6,8 @@ This module provides functions to pack archives into ISO images for optical medi
 """
 import os
 import logging
-import tempfile
-import shutil
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Tuple
 from datetime import datetime
@@ -24,17 +24,45 @@ class MediaPackError(Exception):
 # BD-R single layer capacity in bytes (25GB)
 BD_R_SINGLE_LAYER_CAPACITY = 25 * 1024 * 1024 * 1024
 
+# Read buffer size for archives streamed into ISO images (1 MiB)
+ISO_READ_BUFFER_SIZE = 1 << 20
+
+# Maximum number of threads used for concurrent stat calls
+STAT_MAX_WORKERS = 16
+
+def _safe_stat_size(archive: Path) -> int:
+    """
+    Get the size of an archive with a single stat call.
+    
+    Args:
+        archive: Archive path.
+        
+    Returns:
+        Size in bytes, or 0 if the archive does not exist.
+    """
+    try:
+        return os.stat(archive).st_size
+    except FileNotFoundError:
+        return 0
+
 def calculate_archives_size(archives: List[Path]) -> int:
     """
     Calculate the total size of all archives.
     
+    The stat calls are issued concurrently, which helps on network
+    filesystems and cold caches where each call is latency-bound.
+    
     Args:
         archives: List of archive paths.
         
     Returns:
         Total size in bytes.
     """
-    return sum(archive.stat().st_size for archive in archives if archive.exists())
+    if len(archives) <= 1:
+        return sum(_safe_stat_size(archive) for archive in archives)
+    
+    with ThreadPoolExecutor(max_workers=min(STAT_MAX_WORKERS, len(archives))) as executor:
+        return sum(executor.map(_safe_stat_size, archives))
 
 def create_iso_image(archives: List[Path], output_path: Path, repo_path: Optional[str] = None) -> Path:
     """
@@ -121,21 +149,22 @@ def create_iso_image(archives: List[Path], output_path: Path, repo_path: Optiona
             app_ident_str="https://github.com/kwinsch/historify" # GitHub URL
         )
         
-        # Create a temporary directory for staging
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_dir_path = Path(temp_dir)
-            
-            # Copy all archives to the temporary directory
+        # Stream the archives from our own large-buffered file handles,
+        # which must stay open until the ISO has been written
+        with ExitStack() as stack:
             for archive in archives:
-                if archive.exists():
-                    shutil.copy2(archive, temp_dir_path / archive.name)
-                    
-                    # Add file to ISO using UDF path (avoid ISO9660 restrictions)
-                    iso.add_file(
-                        str(temp_dir_path / archive.name),
-                        f"/{archive.name}",
-                        udf_path=f"/{archive.name}"
-                    )
+                try:
+                    fp = stack.enter_context(open(archive, "rb", buffering=ISO_READ_BUFFER_SIZE))
+                except FileNotFoundError:
+                    continue
+                
+                # Add file to ISO using UDF path (avoid ISO9660 restrictions)
+                iso.add_fp(
+                    fp,
+                    os.fstat(fp.fileno()).st_size,
+                    f"/{archive.name}",
+                    udf_path=f"/{archive.name}"
+                )
             
             # Write the ISO
             iso.write(str(iso_path))
@@ -1,19 +1,170 @@
 """
 Minisign module for historify providing digital signature functionality.
 """
+import os
+import mmap
 import subprocess
 import logging
+import base64
+import binascii
+import hashlib
 import pexpect
 from pathlib import Path
-from typing import Union, Optional, Tuple
+from typing import Union, Optional, Tuple, Dict, Iterable
+
+try:
+    from nacl.signing import VerifyKey
+    from nacl.exceptions import BadSignatureError
+except ImportError:
+    VerifyKey = None
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Minisign signature algorithms: legacy (whole file) and prehashed (BLAKE2b-512)
+SIG_ALG_LEGACY = b"Ed"
+SIG_ALG_PREHASHED = b"ED"
+
+TRUSTED_COMMENT_PREFIX = "trusted comment: "
+
 class MinisignError(Exception):
     """Custom exception for minisign-related errors."""
     pass
 
+def _decode_minisign_line(line: str, expected_len: int) -> bytes:
+    """
+    Decode a base64 line from a minisign key or signature file.
+    
+    Args:
+        line: Base64-encoded line.
+        expected_len: Expected length of the decoded data in bytes.
+        
+    Returns:
+        The decoded bytes.
+        
+    Raises:
+        ValueError: If the line is not valid base64 or has the wrong length.
+    """
+    try:
+        data = base64.b64decode(line.strip(), validate=True)
+    except binascii.Error as e:
+        raise ValueError(f"invalid base64 data: {e}")
+    if len(data) != expected_len:
+        raise ValueError(f"expected {expected_len} bytes, got {len(data)}")
+    return data
+
+def _read_public_key(pubkey_path: Path) -> Tuple[bytes, bytes]:
+    """
+    Read the key ID and Ed25519 key from a minisign public key file.
+    
+    Args:
+        pubkey_path: Path to the minisign public key.
+        
+    Returns:
+        Tuple of (key_id: bytes, public_key: bytes).
+        
+    Raises:
+        OSError: If the file can't be read.
+        ValueError: If the file is not a valid minisign public key.
+    """
+    pub_lines = pubkey_path.read_text().splitlines()
+    if len(pub_lines) < 2:
+        raise ValueError("file too short")
+    
+    # Public key: "Ed" + key ID (8) + Ed25519 public key (32)
+    pub = _decode_minisign_line(pub_lines[1], 42)
+    return pub[2:10], pub[10:]
+
+def _native_verify(file_path: Path, pubkey_path: Path, sig_path: Path, quiet: bool) -> Tuple[bool, str]:
+    """
+    Verify a minisign signature in-process with PyNaCl's Ed25519.
+    
+    Args:
+        file_path: Path to the signed file.
+        pubkey_path: Path to the minisign public key.
+        sig_path: Path to the .minisig signature file.
+        quiet: Whether to suppress the success message.
+        
+    Returns:
+        Tuple of (success: bool, message: str), mirroring the minisign tool output.
+    """
+    try:
+        pub_key_id, public_key = _read_public_key(pubkey_path)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        return False, f"Invalid minisign key or signature file: {e}"
+    
+    return _native_verify_with_key(file_path, pub_key_id, VerifyKey(public_key), sig_path, quiet)
+
+def _native_verify_with_key(
+    file_path: Path,
+    pub_key_id: bytes,
+    verify_key: "VerifyKey",
+    sig_path: Path,
+    quiet: bool
+) -> Tuple[bool, str]:
+    """
+    Verify a minisign signature against an already loaded public key.
+    
+    Args:
+        file_path: Path to the signed file.
+        pub_key_id: Key ID of the public key.
+        verify_key: PyNaCl verify key built from the public key.
+        sig_path: Path to the .minisig signature file.
+        quiet: Whether to suppress the success message.
+        
+    Returns:
+        Tuple of (success: bool, message: str), mirroring the minisign tool output.
+    """
+    try:
+        sig_lines = sig_path.read_text().splitlines()
+        if len(sig_lines) < 4:
+            raise ValueError("file too short")
+        
+        # Signature: algorithm (2) + key ID (8) + Ed25519 signature (64)
+        sig = _decode_minisign_line(sig_lines[1], 74)
+        global_sig = _decode_minisign_line(sig_lines[3], 64)
+        
+        if not sig_lines[2].startswith(TRUSTED_COMMENT_PREFIX):
+            raise ValueError("missing trusted comment")
+        trusted_comment = sig_lines[2][len(TRUSTED_COMMENT_PREFIX):]
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        return False, f"Invalid minisign key or signature file: {e}"
+    
+    sig_alg, sig_key_id, signature = sig[:2], sig[2:10], sig[10:]
+    
+    if sig_key_id != pub_key_id:
+        return False, (
+            f"Signature key id in {sig_path} is {sig_key_id[::-1].hex().upper()} "
+            f"but the key id in the public key is {pub_key_id[::-1].hex().upper()}"
+        )
+    
+    if sig_alg == SIG_ALG_PREHASHED:
+        hasher = hashlib.blake2b(digest_size=64)
+        with open(file_path, "rb") as f:
+            # Hash straight from the page cache; mmap can't map empty files
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    hasher.update(mm)
+        message = hasher.digest()
+    elif sig_alg == SIG_ALG_LEGACY:
+        message = file_path.read_bytes()
+    else:
+        return False, "Unsupported signature algorithm"
+    
+    try:
+        verify_key.verify(message, signature)
+    except BadSignatureError:
+        return False, "Signature verification failed"
+    
+    try:
+        verify_key.verify(signature + trusted_comment.encode("utf-8"), global_sig)
+    except BadSignatureError:
+        return False, "Comment signature verification failed"
+    
+    if quiet:
+        return True, ""
+    return True, f"Signature and comment signature verified\nTrusted comment: {trusted_comment}"
+
 def minisign_sign(
     file_path: Union[str, Path], 
     key_path: Union[str, Path], 
@@ -118,6 +269,9 @@ def minisign_verify(
     """
     Verify a minisign signature.
 
+    Uses an in-process Ed25519 verification when PyNaCl is available and
+    falls back to running the minisign tool otherwise.
+
     Args:
         file_path: Path to the signed file.
         pubkey_path: Path to the minisign public key.
@@ -141,6 +295,14 @@ def minisign_verify(
     if not sig_path.is_file():
         raise MinisignError(f"Signature file does not exist: {sig_path}")
 
+    if VerifyKey is not None:
+        success, message = _native_verify(file_path, pubkey_path, sig_path, quiet)
+        if success:
+            logger.info(f"Successfully verified signature for {file_path}")
+        else:
+            logger.error(f"Verification failed: {message}")
+        return success, message
+
     # Build the command
     cmd = [tool_path, "-Vm", str(file_path), "-p", str(pubkey_path)]
     
@@ -163,3 +325,63 @@ def minisign_verify(
     except subprocess.SubprocessError as e:
         logger.error(f"Subprocess error during verification: {e}")
         return False, str(e)
+
+def minisign_verify_many(
+    file_paths: Iterable[Union[str, Path]],
+    pubkey_path: Union[str, Path],
+    tool_path: str = "minisign",
+    quiet: bool = False
+) -> Dict[Path, Tuple[bool, str]]:
+    """
+    Verify the minisign signatures of several files against one public key.
+    
+    With PyNaCl available the public key is parsed once and every file is
+    verified in-process, so no minisign process is started. Otherwise each
+    file goes through minisign_verify().
+    
+    Args:
+        file_paths: Paths to the signed files.
+        pubkey_path: Path to the minisign public key.
+        tool_path: Path to the minisign binary (default: "minisign").
+        quiet: Whether to suppress success messages.
+        
+    Returns:
+        Dictionary mapping each file path to its (success, message) result.
+        Files with a missing signature are reported as failed.
+        
+    Raises:
+        MinisignError: If the public key doesn't exist, or the tool is needed
+            and can't be found.
+    """
+    pubkey_path = Path(pubkey_path)
+    if not pubkey_path.is_file():
+        raise MinisignError(f"Public key file does not exist: {pubkey_path}")
+    
+    verify_key = None
+    if VerifyKey is not None:
+        try:
+            pub_key_id, public_key = _read_public_key(pubkey_path)
+            verify_key = VerifyKey(public_key)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            message = f"Invalid minisign key or signature file: {e}"
+            return {Path(p): (False, message) for p in file_paths}
+    
+    results = {}
+    for file_path in map(Path, file_paths):
+        sig_path = Path(f"{file_path}.minisig")
+        if not file_path.is_file():
+            results[file_path] = (False, f"File does not exist: {file_path}")
+        elif not sig_path.is_file():
+            results[file_path] = (False, f"Signature file does not exist: {sig_path}")
+        elif verify_key is not None:
+            results[file_path] = _native_verify_with_key(file_path, pub_key_id, verify_key, sig_path, quiet)
+        else:
+            results[file_path] = minisign_verify(file_path, pubkey_path, tool_path=tool_path, quiet=quiet)
+        
+        success, message = results[file_path]
+        if success:
+            logger.info(f"Successfully verified signature for {file_path}")
+        else:
+            logger.error(f"Verification failed for {file_path}: {message}")
+    
+    return results
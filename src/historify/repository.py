@@ -2,16 +2,36 @@
 Repository module for historify that handles repository initialization and structure.
 """
 import os
+import errno
 import logging
-import secrets
 import csv
 import configparser
 from datetime import datetime, UTC
 from pathlib import Path
 from typing import Optional, Dict
 
+from historify.csv_manager import INTEGRITY_HEADER
+
 logger = logging.getLogger(__name__)
 
+# Size of the random seed file (1 MiB)
+SEED_SIZE = 1024 * 1024
+
+# Chunk size used when streaming random data into the seed file
+SEED_CHUNK_SIZE = 64 * 1024
+
+# Initial INI configuration written at repository creation
+CONFIG_TEMPLATE = """[repository]
+name = {name}
+created = {created}
+
+[hash]
+algorithms = blake3,sha256
+
+[changes]
+directory = changes
+"""
+
 class RepositoryError(Exception):
     """Exception raised for repository-related errors."""
     pass
@@ -27,7 +47,10 @@ class Repository:
             repo_path: Path to the repository.
             name: Repository name (defaults to directory name).
         """
-        self.path = Path(repo_path).resolve()
+        # abspath normalizes without a realpath walk; symlinked repositories
+        # are used as given, and callers that need a canonical path resolve
+        # it once before constructing this or the config/changelog objects
+        self.path = Path(os.path.abspath(repo_path))
         self.name = name or self.path.name
         
         # Repository structure paths
@@ -76,40 +99,80 @@ class Repository:
         """Create configuration files."""
         logger.debug(f"Creating config files")
         
-        # Create INI config file
+        created = datetime.now(UTC).isoformat()
+        
+        # Create INI config file in a single write
         with open(self.config_file, "w") as f:
-            f.write(f"[repository]\n")
-            f.write(f"name = {self.name}\n")
-            f.write(f"created = {datetime.now(UTC).isoformat()}\n")
-            f.write(f"\n")
-            f.write(f"[hash]\n")
-            f.write(f"algorithms = blake3,sha256\n")
-            f.write(f"\n")
-            f.write(f"[changes]\n")
-            f.write(f"directory = changes\n")
+            f.write(CONFIG_TEMPLATE.format(name=self.name, created=created))
         
-        # Create CSV config file
+        # Create CSV config file in a single batch
         with open(self.config_csv, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=["key", "value"])
-            writer.writeheader()
-            writer.writerow({"key": "repository.name", "value": self.name})
-            writer.writerow({"key": "repository.created", "value": datetime.now(UTC).isoformat()})
-            writer.writerow({"key": "hash.algorithms", "value": "blake3,sha256"})
-            writer.writerow({"key": "changes.directory", "value": "changes"})
+            writer = csv.writer(f)
+            writer.writerows([
+                ("key", "value"),
+                ("repository.name", self.name),
+                ("repository.created", created),
+                ("hash.algorithms", "blake3,sha256"),
+                ("changes.directory", "changes"),
+            ])
     
     def _create_seed(self) -> None:
         """Create random seed file."""
         logger.debug(f"Creating seed file")
         
-        with open(self.seed_file, "wb") as f:
-            f.write(secrets.token_bytes(1024 * 1024))  # 1MB of random data
+        fd = os.open(self.seed_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            # Let the kernel copy from /dev/urandom where it can, then write
+            # whatever is left from os.urandom() straight to the descriptor
+            remaining = self._send_urandom(fd, SEED_SIZE)
+            while remaining:
+                chunk = memoryview(os.urandom(min(remaining, SEED_CHUNK_SIZE)))
+                remaining -= len(chunk)
+                while chunk:
+                    chunk = chunk[os.write(fd, chunk):]
+        finally:
+            os.close(fd)
+    
+    def _send_urandom(self, fd: int, count: int) -> int:
+        """
+        Copy random bytes from /dev/urandom to a file with sendfile(2).
+        
+        The data never passes through a Python buffer. Platforms or kernels
+        that can't sendfile from /dev/urandom are left to the caller.
+        
+        Args:
+            fd: File descriptor to write to.
+            count: Number of bytes wanted.
+            
+        Returns:
+            Number of bytes still to be written.
+        """
+        if not hasattr(os, "sendfile"):
+            return count
+        
+        try:
+            src = os.open("/dev/urandom", os.O_RDONLY)
+        except OSError:
+            return count
+        
+        try:
+            while count:
+                sent = os.sendfile(fd, src, None, count)
+                if not sent:
+                    break
+                count -= sent
+        except OSError as e:
+            if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                raise
+            logger.debug(f"sendfile from /dev/urandom unavailable: {e}")
+        finally:
+            os.close(src)
+        
+        return count
     
     def _create_integrity_csv(self) -> None:
         """Create integrity CSV file."""
         logger.debug(f"Creating integrity CSV file")
         
         with open(self.integrity_csv, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                "changelog_file", "blake3", "signature_file", "verified", "verified_timestamp"
-            ])
-            writer.writeheader()
+            f.write(INTEGRITY_HEADER)
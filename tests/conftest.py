@@ -0,0 +1,61 @@
+"""
+Shared pytest fixtures for the historify test suite.
+"""
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from historify.cli_init import init_repository
+from tests.helpers import write_minimal_repository, write_mock_minisign_keys
+
+def pytest_configure(config):
+    """
+    Skip the .pytest_cache writes when HISTORIFY_SKIP_CACHE is set.
+    
+    The cache provider itself stays loaded, so --cache-show and friends keep
+    working; only the last-failed and new-first plugins, which write the
+    cache at the end of every session, are dropped.
+    """
+    if os.environ.get("HISTORIFY_SKIP_CACHE"):
+        for name in ("lfplugin", "nfplugin"):
+            plugin = config.pluginmanager.get_plugin(name)
+            if plugin is not None:
+                config.pluginmanager.unregister(plugin)
+
+@pytest.fixture(scope="session")
+def runner():
+    """Provide one CliRunner for the whole session; it keeps no per-test state."""
+    return CliRunner()
+
+@pytest.fixture(autouse=True)
+def _attach_runner(request, runner):
+    """Expose the shared CliRunner as self.runner on class-based tests."""
+    if request.instance is not None:
+        request.instance.runner = runner
+
+@pytest.fixture(scope="session")
+def stub_repo(tmp_path_factory):
+    """
+    Provide a bare repository layout shared by the whole session.
+    
+    Only for tests that mock the command handlers and just need a path that
+    passes Click's existence check; tests must not modify it.
+    """
+    return write_minimal_repository(tmp_path_factory.mktemp("stub") / "repo_dir")
+
+@pytest.fixture(scope="session")
+def minisign_keys(tmp_path_factory):
+    """Provide one placeholder minisign key pair, as (key, pub), for the whole session."""
+    return write_mock_minisign_keys(tmp_path_factory.mktemp("keys"))
+
+@pytest.fixture(scope="session")
+def template_repo(tmp_path_factory):
+    """
+    Provide an initialized repository named test-repo, built once per session.
+    
+    Tests copy it with copy_template_repository() and must not modify it.
+    """
+    template = tmp_path_factory.mktemp("template") / "test-repo"
+    init_repository(str(template), "test-repo")
+    return template
@@ -0,0 +1,173 @@
+"""
+Shared helpers for the historify test suite.
+"""
+import csv
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+from unittest.mock import Mock
+
+from historify.changelog import Changelog
+
+# Buffer size for reading and rewriting CSV files
+CSV_BUFFER_SIZE = 1 << 16
+
+def copy_template_repository(template: Union[str, Path], dest: Union[str, Path]) -> Path:
+    """
+    Create an initialized repository at dest by copying a template.
+    
+    The template comes from the session-scoped template_repo fixture, so the
+    seed generation and config writes happen once per test session instead
+    of once per test.
+    
+    Args:
+        template: Path to the initialized template repository.
+        dest: Path of the repository to create; must not exist yet.
+    
+    Returns:
+        Path to the new repository.
+    """
+    shutil.copytree(template, dest)
+    return Path(dest)
+
+def write_minimal_repository(repo_dir: Union[str, Path], hash_config: bool = True) -> Path:
+    """
+    Create the bare repository layout that passes the CLI's path checks.
+    
+    Only db/, changes/ and a short db/config are written, for tests that mock
+    everything behind the CLI handlers.
+    
+    Args:
+        repo_dir: Path of the repository to create.
+        hash_config: Whether to include the [hash] section in db/config.
+        
+    Returns:
+        Path to the repository.
+    """
+    repo_dir = Path(repo_dir)
+    (repo_dir / "db").mkdir(parents=True)
+    (repo_dir / "changes").mkdir()
+    
+    config_text = "[repository]\nname = test-repo\n"
+    if hash_config:
+        config_text += "[hash]\nalgorithms = blake3,sha256\n"
+    (repo_dir / "db" / "config").write_text(config_text)
+    return repo_dir
+
+def write_mock_minisign_keys(key_dir: Union[str, Path]) -> Tuple[Path, Path]:
+    """
+    Write a placeholder minisign key pair for tests that mock signing.
+    
+    The files only have to exist and look like minisign keys; they are not
+    valid keys and tests must not modify them.
+    
+    Args:
+        key_dir: Directory to write historify.key and historify.pub into.
+        
+    Returns:
+        Tuple of (secret key path, public key path).
+    """
+    key_dir = Path(key_dir)
+    key_dir.mkdir(parents=True, exist_ok=True)
+    
+    key_path = key_dir / "historify.key"
+    pub_path = key_dir / "historify.pub"
+    key_path.write_text("untrusted comment: minisign unencrypted secret key\nTESTKEY123456789\n")
+    pub_path.write_text("untrusted comment: minisign public key\nTESTPUB987654321\n")
+    return key_path, pub_path
+
+def append_ini_section(config_file: Union[str, Path], section: str, values: Dict[str, str]) -> None:
+    """
+    Append a new section to an INI file in a single write.
+    
+    Unlike RepositoryConfig.set(), this neither rewrites the whole file per
+    key nor runs side effects such as the public key backup.
+    
+    Args:
+        config_file: Path to the INI file; must not contain the section yet.
+        section: Section name.
+        values: Options to write, in order.
+    """
+    lines = [f"\n[{section}]"]
+    lines.extend(f"{option} = {value}" for option, value in values.items())
+    with open(config_file, "a") as f:
+        f.write("\n".join(lines) + "\n")
+
+def strip_ini_key(config_file: Union[str, Path], section: str, key: str) -> bool:
+    """
+    Remove one option from an INI file by rewriting its text in place.
+    
+    Args:
+        config_file: Path to the INI file.
+        section: Section holding the option.
+        key: Option name.
+        
+    Returns:
+        True if the option was found and removed.
+    """
+    config_file = Path(config_file)
+    text = config_file.read_text()
+    
+    section_re = re.compile(rf"^\[{re.escape(section)}\][^\n]*\n.*?(?=^\[|\Z)", re.M | re.S)
+    option_re = re.compile(rf"^{re.escape(key)}\s*[=:][^\n]*\n?", re.M)
+    
+    removed = False
+    
+    def strip_option(match: re.Match) -> str:
+        nonlocal removed
+        body, count = option_re.subn("", match.group(0))
+        removed = removed or count > 0
+        return body
+    
+    new_text = section_re.sub(strip_option, text, count=1)
+    if removed:
+        config_file.write_text(new_text)
+    return removed
+
+def strip_csv_key(csv_path: Union[str, Path], key: str) -> bool:
+    """
+    Remove every row with the given key from a key/value CSV file.
+    
+    Args:
+        csv_path: Path to the CSV file.
+        key: Value of the "key" column to remove.
+        
+    Returns:
+        True if at least one row was removed.
+    """
+    csv_path = Path(csv_path)
+    with open(csv_path, "r", newline="", buffering=CSV_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        key_index = header.index("key")
+        all_rows = list(reader)
+    
+    rows = [row for row in all_rows if row[key_index] != key]
+    if len(rows) == len(all_rows):
+        return False
+    
+    # Write header and rows in one batch to a sibling file, then swap it in
+    tmp_path = csv_path.with_name(csv_path.name + ".tmp")
+    with open(tmp_path, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
+        csv.writer(f).writerows([header, *rows])
+    os.replace(tmp_path, csv_path)
+    return True
+
+def changelog_mock(**attributes: Any) -> Mock:
+    """
+    Build a stand-in for a Changelog instance.
+    
+    A plain Mock spec'd on Changelog is used rather than a MagicMock: it
+    skips setting up the magic methods on every construction, and the spec
+    rejects misspelled method names.
+    
+    Args:
+        **attributes: Attributes to configure, in Mock.configure_mock() form
+            (e.g. **{"start_closing.return_value": (True, "")}).
+        
+    Returns:
+        The configured mock.
+    """
+    return Mock(spec=Changelog, **attributes)
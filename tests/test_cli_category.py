@@ -7,25 +7,24 @@ import csv
 import shutil
 import click
 from pathlib import Path
-from click.testing import CliRunner
 from unittest.mock import patch, MagicMock
 
 from historify.cli import add_category
-from historify.cli_category import handle_add_category_command, CategoryError
+from historify.cli_category import handle_add_category_command
 from historify.config import RepositoryConfig
-from historify.cli_init import init_repository
+from historify.csv_manager import CHANGELOG_HEADER
+from tests.helpers import copy_template_repository
 
 class TestCategoryImplementation:
     """Test the category command implementation."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.runner = CliRunner()
-        self.test_repo_path = Path("test_repo_category").absolute()
+    @pytest.fixture(autouse=True)
+    def setup_repo(self, tmp_path, template_repo):
+        """Set up test environment in a per-test temporary directory."""
+        self.test_repo_path = tmp_path / "test_repo_category"
         
-        # Initialize a test repository
-        if not self.test_repo_path.exists():
-            init_repository(str(self.test_repo_path), "test-repo")
+        # Copy the session-wide template repository
+        copy_template_repository(template_repo, self.test_repo_path)
         
         # Create a changelog file
         self.changes_dir = self.test_repo_path / "changes"
@@ -34,16 +33,7 @@ class TestCategoryImplementation:
         
         # Create a header row for the CSV
         with open(self.test_changelog, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "timestamp", "transaction_type", "path", "category", 
-                "size", "ctime", "mtime", "sha256", "blake3"
-            ])
-    
-    def teardown_method(self):
-        """Clean up test environment."""
-        if self.test_repo_path.exists():
-            shutil.rmtree(self.test_repo_path)
+            f.write(CHANGELOG_HEADER)
     
     def test_add_category_internal(self):
         """Test adding an internal category."""
@@ -123,7 +113,7 @@ class TestCategoryImplementation:
         result = self.runner.invoke(add_category, ["documents", "docs", str(self.test_repo_path)])
         
         assert result.exit_code == 0
-        assert "Added category 'documents'" in result.output
+        assert result.output.startswith("Added category 'documents'")
         assert "internal path" in result.output
         
         # Verify directory was created
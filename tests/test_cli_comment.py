@@ -2,31 +2,25 @@
 Tests for the comment command implementation.
 """
 import pytest
-import os
 import csv
-import shutil
-from pathlib import Path
-from click.testing import CliRunner
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 from historify.cli import comment
 from historify.changelog import Changelog, ChangelogError
-from historify.config import RepositoryConfig
-from historify.cli_init import init_repository
 from historify.cli_comment import handle_comment_command
-from historify.csv_manager import CSVManager, CSVError
+from historify.csv_manager import CHANGELOG_HEADER
+from tests.helpers import changelog_mock, copy_template_repository, write_minimal_repository
 
 class TestCommentImplementation:
     """Test the comment command implementation."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.runner = CliRunner()
-        self.test_repo_path = Path("test_repo_comment").absolute()
+    @pytest.fixture(autouse=True)
+    def setup_repo(self, tmp_path, template_repo):
+        """Set up test environment in a per-test temporary directory."""
+        self.test_repo_path = tmp_path / "test_repo_comment"
         
-        # Initialize a test repository
-        if not self.test_repo_path.exists():
-            init_repository(str(self.test_repo_path), "test-repo")
+        # Copy the session-wide template repository
+        copy_template_repository(template_repo, self.test_repo_path)
         
         # Create a dummy changelog file
         self.changes_dir = self.test_repo_path / "changes"
@@ -35,16 +29,7 @@ class TestCommentImplementation:
         
         # Create a header row for the CSV
         with open(self.test_changelog, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "timestamp", "transaction_type", "path", "category", 
-                "size", "ctime", "mtime", "sha256", "blake3"
-            ])
-    
-    def teardown_method(self):
-        """Clean up test environment."""
-        if self.test_repo_path.exists():
-            shutil.rmtree(self.test_repo_path)
+            f.write(CHANGELOG_HEADER)
     
     def test_write_comment(self):
         """Test writing a comment to the changelog."""
@@ -91,7 +76,7 @@ class TestCommentImplementation:
     def test_cli_comment_command(self, mock_changelog_class):
         """Test CLI comment command."""
         # Set up mock
-        mock_changelog = MagicMock()
+        mock_changelog = changelog_mock()
         mock_changelog.get_current_changelog.return_value = self.test_changelog
         mock_changelog.write_comment.return_value = True
         mock_changelog_class.return_value = mock_changelog
@@ -99,11 +84,8 @@ class TestCommentImplementation:
         # Run the command
         with self.runner.isolated_filesystem():
             # Create a simple repository structure
-            os.makedirs("repo_dir/db")
-            os.makedirs("repo_dir/changes")
-            with open("repo_dir/db/config", "w") as f:
-                f.write("[repository]\nname = test-repo\n")
-                
+            write_minimal_repository("repo_dir", hash_config=False)
+            
             result = self.runner.invoke(comment, ["Test comment", "repo_dir"])
             
             assert result.exit_code == 0
@@ -117,18 +99,15 @@ class TestCommentImplementation:
     def test_cli_comment_no_changelog(self, mock_changelog_class):
         """Test CLI comment command with no open changelog."""
         # Set up mock
-        mock_changelog = MagicMock()
+        mock_changelog = changelog_mock()
         mock_changelog.get_current_changelog.return_value = None
         mock_changelog_class.return_value = mock_changelog
         
         # Run the command
         with self.runner.isolated_filesystem():
             # Create a simple repository structure
-            os.makedirs("repo_dir/db")
-            os.makedirs("repo_dir/changes")
-            with open("repo_dir/db/config", "w") as f:
-                f.write("[repository]\nname = test-repo\n")
-                
+            write_minimal_repository("repo_dir", hash_config=False)
+            
             result = self.runner.invoke(comment, ["Test comment", "repo_dir"])
             
             assert result.exit_code != 0
@@ -2,64 +2,57 @@
 Tests for the config command implementation.
 """
 import pytest
+import io
 import os
 import csv
-import shutil
 import configparser
-from pathlib import Path
-from click.testing import CliRunner
 from unittest.mock import patch, MagicMock
 
-from historify.cli import init, config, check_config
-from historify.config import RepositoryConfig, ConfigError
+from historify.cli import config, check_config
 from historify.cli_init import init_repository
+from historify.config import RepositoryConfig, ConfigError, FastConfigParser
+from tests.helpers import copy_template_repository, strip_csv_key, strip_ini_key
 
 class TestConfigImplementation:
     """Test the configuration command implementation."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.runner = CliRunner()
-        self.test_repo_path = Path("test_repo_config")
+    @pytest.fixture(autouse=True)
+    def setup_repo(self, tmp_path, template_repo):
+        """Set up test environment in a per-test temporary directory."""
+        self.tmp_path = tmp_path
+        self.test_repo_path = tmp_path / "test_repo_config"
         
         # Initialize a test repository
-        if not self.test_repo_path.exists():
-            init_repository(str(self.test_repo_path), "test-repo")
+        copy_template_repository(template_repo, self.test_repo_path)
     
-    def teardown_method(self):
-        """Clean up test environment."""
-        if self.test_repo_path.exists():
-            shutil.rmtree(self.test_repo_path)
+    @pytest.fixture
+    def repo_config(self):
+        """Provide a RepositoryConfig for the test repository."""
+        return RepositoryConfig(str(self.test_repo_path))
     
-    def test_repository_config_init(self):
+    def test_repository_config_init(self, repo_config):
         """Test RepositoryConfig class initialization."""
-        config = RepositoryConfig(str(self.test_repo_path))
-        assert config.repo_path == self.test_repo_path.resolve()
-        assert config.db_dir == self.test_repo_path.resolve() / "db"
-        assert config.config_file == self.test_repo_path.resolve() / "db" / "config"
-        assert config.config_csv == self.test_repo_path.resolve() / "db" / "config.csv"
+        assert repo_config.repo_path == self.test_repo_path.resolve()
+        assert repo_config.db_dir == self.test_repo_path.resolve() / "db"
+        assert repo_config.config_file == self.test_repo_path.resolve() / "db" / "config"
+        assert repo_config.config_csv == self.test_repo_path.resolve() / "db" / "config.csv"
     
     def test_repository_config_init_invalid(self):
         """Test RepositoryConfig with invalid repository."""
-        invalid_path = Path("invalid_repo")
-        if invalid_path.exists():
-            shutil.rmtree(invalid_path)
+        invalid_path = self.tmp_path / "invalid_repo"
         invalid_path.mkdir(parents=True)
         
         with pytest.raises(ConfigError, match="Not a valid historify repository"):
             RepositoryConfig(str(invalid_path))
-        
-        shutil.rmtree(invalid_path)
     
-    def test_set_get_config(self):
+    def test_set_get_config(self, repo_config):
         """Test setting and getting configuration values."""
         # Set a value
-        config = RepositoryConfig(str(self.test_repo_path))
-        result = config.set("test.value", "testing123")
+        result = repo_config.set("test.value", "testing123")
         assert result is True
         
         # Get the value
-        value = config.get("test.value")
+        value = repo_config.get("test.value")
         assert value == "testing123"
         
         # Check it was saved in INI file
@@ -69,7 +62,8 @@ class TestConfigImplementation:
         assert "value" in parser["test"]
         assert parser["test"]["value"] == "testing123"
         
-        # Check it was saved in CSV file
+        # Check it appears in the CSV file once exported
+        assert repo_config.export_csv() is True
         with open(self.test_repo_path / "db" / "config.csv", "r", newline="") as f:
             reader = csv.DictReader(f)
             for row in reader:
@@ -79,44 +73,77 @@ class TestConfigImplementation:
             else:
                 pytest.fail("Config value not found in CSV file")
     
-    def test_set_config_invalid_key(self):
-        """Test setting config with invalid key format."""
+    def test_fast_config_parser_matches_configparser(self):
+        """Test that FastConfigParser reads and writes like configparser."""
+        text = (
+            "# comment\n"
+            "[repository]\n"
+            "Name = test-repo\n"
+            "created: 2025-04-22 12:00:00 UTC\n"
+            "\n"
+            "[category]\n"
+            "docs.path = /data/docs = old\n"
+            "notes = first\n"
+            "    second\n"
+        )
+        reference = configparser.ConfigParser(interpolation=None)
+        reference.read_string(text)
+        
+        parser = FastConfigParser()
+        parser.read_string(text)
+        
+        assert parser.sections() == reference.sections()
+        for section in reference.sections():
+            for option, value in reference.items(section):
+                assert parser.get(section, option) == value
+        
+        expected = io.StringIO()
+        reference.write(expected)
+        written = io.StringIO()
+        parser.write(written)
+        assert written.getvalue() == expected.getvalue()
+        
+        with pytest.raises(ConfigError, match="Invalid line"):
+            FastConfigParser().read_string("orphan = value\n")
+    
+    def test_config_cache_invalidation(self):
+        """Test that cached config parses follow changes on disk."""
         config = RepositoryConfig(str(self.test_repo_path))
+        assert config.get("repository.name") == "test-repo"
+        
+        # A second instance reuses the cached parse without re-reading
+        with patch.object(FastConfigParser, "read") as mock_read:
+            assert RepositoryConfig(str(self.test_repo_path)).get("repository.name") == "test-repo"
+            mock_read.assert_not_called()
+        
+        # Values written through set() are visible to new instances
+        config.set("test.value", "first")
+        assert RepositoryConfig(str(self.test_repo_path)).get("test.value") == "first"
+        
+        # External edits change the file stamp and are picked up
+        config_csv = self.test_repo_path / "db" / "config.csv"
+        with open(config_csv, "a", newline="") as f:
+            csv.writer(f).writerow(["extra.key", "external"])
+        assert config.get("extra.key") == "external"
+    
+    def test_set_config_invalid_key(self, repo_config):
+        """Test setting config with invalid key format."""
         with pytest.raises(ConfigError, match="Invalid key format"):
-            config.set("invalid_key", "value")
+            repo_config.set("invalid_key", "value")
     
-    def test_check_config(self):
+    def test_check_config(self, repo_config):
         """Test checking configuration."""
-        config = RepositoryConfig(str(self.test_repo_path))
-        
         # Initially, config should be valid (from repository initialization)
-        issues = config.check()
+        issues = repo_config.check()
         assert not issues
         
         # Remove a required config from both storage locations
         
         # Remove from INI file
-        config_file = self.test_repo_path / "db" / "config"
-        parser = configparser.ConfigParser()
-        parser.read(config_file)
-        if "hash" in parser and "algorithms" in parser["hash"]:
-            del parser["hash"]["algorithms"]
-            with open(config_file, "w") as f:
-                parser.write(f)
+        strip_ini_key(self.test_repo_path / "db" / "config", "hash", "algorithms")
         
         # Remove from CSV file
-        config_csv = self.test_repo_path / "db" / "config.csv"
-        rows = []
-        with open(config_csv, "r", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row["key"] != "hash.algorithms":
-                    rows.append(row)
-        
-        with open(config_csv, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=["key", "value"])
-            writer.writeheader()
-            writer.writerows(rows)
+        strip_csv_key(self.test_repo_path / "db" / "config.csv", "hash.algorithms")
         
         # Config should now have issues
         config = RepositoryConfig(str(self.test_repo_path))  # Re-read config
@@ -124,16 +151,14 @@ class TestConfigImplementation:
         assert issues
         assert any(key == "hash.algorithms" for key, _ in issues)
     
-    def test_list_config(self):
+    def test_list_config(self, repo_config):
         """Test listing all configuration values."""
-        config = RepositoryConfig(str(self.test_repo_path))
-        
         # Set some test values
-        config.set("test.one", "value1")
-        config.set("test.two", "value2")
+        repo_config.set("test.one", "value1")
+        repo_config.set("test.two", "value2")
         
         # List all values
-        all_config = config.list_all()
+        all_config = repo_config.list_all()
         
         # Check our test values are included
         assert "test.one" in all_config
@@ -147,67 +172,50 @@ class TestConfigImplementation:
     
     def test_cli_config_command(self):
         """Test CLI config command."""
-        with self.runner.isolated_filesystem():
-            # First initialize a repository
-            self.runner.invoke(init, ["./repo_dir", "--name", "test-repo"])
-            
-            # Set a configuration value
-            result = self.runner.invoke(config, ["test.cli", "cli-value", "./repo_dir"])
-            
-            assert result.exit_code == 0
-            assert "Setting test.cli = cli-value in" in result.output
-            assert "Configuration updated successfully" in result.output
-            
-            # Verify the value was set
-            config_obj = RepositoryConfig("./repo_dir")
-            assert config_obj.get("test.cli") == "cli-value"
+        # First initialize a repository
+        repo_dir = str(self.tmp_path / "repo_dir")
+        init_repository(repo_dir, "test-repo")
+        
+        # Set a configuration value
+        result = self.runner.invoke(config, ["test.cli", "cli-value", repo_dir])
+        
+        assert result.exit_code == 0
+        assert result.output.startswith(f"Setting test.cli = cli-value in {repo_dir}")
+        assert "Configuration updated successfully" in result.output
+        
+        # Verify the value was set
+        config_obj = RepositoryConfig(repo_dir)
+        assert config_obj.get("test.cli") == "cli-value"
     
     def test_cli_check_config_command(self):
         """Test CLI check-config command."""
-        with self.runner.isolated_filesystem():
-            # First initialize a repository
-            self.runner.invoke(init, ["./repo_dir", "--name", "test-repo"])
-            
-            # Check configuration (should pass)
-            result = self.runner.invoke(check_config, ["./repo_dir"])
-            
-            assert result.exit_code == 0
-            assert "Checking configuration in" in result.output
-            assert "Configuration check passed with no issues" in result.output
-            
-            # Modify both INI file and CSV files to remove a required config
-            
-            # Remove from INI file
-            config_file = Path("./repo_dir/db/config")
-            parser = configparser.ConfigParser()
-            parser.read(config_file)
-            if "repository" in parser and "name" in parser["repository"]:
-                del parser["repository"]["name"]
-                with open(config_file, "w") as f:
-                    parser.write(f)
-            
-            # Remove from CSV file
-            config_csv = Path("./repo_dir/db/config.csv")
-            rows = []
-            with open(config_csv, "r", newline="") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row["key"] != "repository.name":
-                        rows.append(row)
-            
-            with open(config_csv, "w", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=["key", "value"])
-                writer.writeheader()
-                writer.writerows(rows)
-            
-            # Check configuration again (should find issues)
-            result = self.runner.invoke(check_config, ["./repo_dir"])
-            
-            assert result.exit_code == 0
-            assert "Configuration issues found:" in result.output
-            assert "repository.name" in result.output
+        # First initialize a repository
+        repo_dir = str(self.tmp_path / "repo_dir")
+        init_repository(repo_dir, "test-repo")
+        
+        # Check configuration (should pass)
+        result = self.runner.invoke(check_config, [repo_dir])
+        
+        assert result.exit_code == 0
+        assert result.output.startswith(f"Checking configuration in {repo_dir}")
+        assert "Configuration check passed with no issues" in result.output
+        
+        # Modify both INI file and CSV files to remove a required config
+        
+        # Remove from INI file
+        strip_ini_key(self.tmp_path / "repo_dir" / "db" / "config", "repository", "name")
+        
+        # Remove from CSV file
+        strip_csv_key(self.tmp_path / "repo_dir" / "db" / "config.csv", "repository.name")
+        
+        # Check configuration again (should find issues)
+        result = self.runner.invoke(check_config, [repo_dir])
+        
+        assert result.exit_code == 0
+        assert "Configuration issues found:" in result.output
+        assert "repository.name" in result.output
 
-    def test_config_backup_public_key(self):
+    def test_config_backup_public_key(self, repo_config):
         """Test public key backup when setting minisign.pub configuration."""
         # Create a test public key
         pub_key_path = self.test_repo_path / "test.pub"
@@ -216,8 +224,7 @@ class TestConfigImplementation:
             f.write("TESTKEY123456789\n")
         
         # Set the minisign.pub config value
-        config = RepositoryConfig(str(self.test_repo_path))
-        config.set("minisign.pub", str(pub_key_path))
+        repo_config.set("minisign.pub", str(pub_key_path))
         
         # Verify the key was backed up
         keys_dir = self.test_repo_path / "db" / "keys"
@@ -4,58 +4,53 @@ Tests for the lifecycle commands (start, closing) implementation.
 import pytest
 import os
 import csv
-import shutil
+from contextlib import ExitStack
 from pathlib import Path
-from click.testing import CliRunner
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
-from historify.cli import init, config, start_transaction, closing
-from historify.changelog import Changelog, ChangelogError
-from historify.config import RepositoryConfig
-from historify.cli_init import init_repository
+from historify.cli import start_transaction, closing
+from historify.changelog import Changelog
+from historify.csv_manager import CSVManager
+from tests.helpers import append_ini_section, changelog_mock, copy_template_repository, write_minimal_repository
 
 class TestLifecycleImplementation:
     """Test the lifecycle command implementations."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.runner = CliRunner()
-        self.test_repo_path = Path("test_repo_lifecycle").absolute()
+    @pytest.fixture(autouse=True)
+    def setup_repo(self, tmp_path, minisign_keys, template_repo):
+        """Set up test environment in a per-test temporary directory."""
+        self.tmp_path = tmp_path
+        self.test_repo_path = tmp_path / "test_repo_lifecycle"
         
         # Initialize a test repository
-        if not self.test_repo_path.exists():
-            init_repository(str(self.test_repo_path), "test-repo")
+        copy_template_repository(template_repo, self.test_repo_path)
         
-        # Create test minisign key files
-        self.key_dir = Path("test_keys").absolute()
-        self.key_dir.mkdir(parents=True, exist_ok=True)
-        
-        self.minisign_key = self.key_dir / "historify.key"
-        self.minisign_pub = self.key_dir / "historify.pub"
+        # Share the session-wide placeholder minisign keys
+        self.minisign_key, self.minisign_pub = minisign_keys
+    
+    def configure_minisign(self):
+        """Point the test repository at the mock minisign keys."""
+        append_ini_section(self.test_repo_path / "db" / "config", "minisign", {
+            "key": str(self.minisign_key),
+            "pub": str(self.minisign_pub),
+        })
+    
+    @pytest.fixture
+    def sign_calls(self, monkeypatch):
+        """Replace changelog signing with a stub that records its calls."""
+        calls = []
         
-        # Create mock minisign key files
-        with open(self.minisign_key, "w") as f:
-            f.write("untrusted comment: minisign unencrypted secret key\n")
-            f.write("TESTKEY123456789\n")
+        def fake_sign(*args, **kwargs):
+            calls.append((args, kwargs))
+            return True
         
-        with open(self.minisign_pub, "w") as f:
-            f.write("untrusted comment: minisign public key\n")
-            f.write("TESTPUB987654321\n")
+        monkeypatch.setattr("historify.changelog.minisign_sign", fake_sign)
+        return calls
     
-    def teardown_method(self):
-        """Clean up test environment."""
-        if self.test_repo_path.exists():
-            shutil.rmtree(self.test_repo_path)
-        if self.key_dir.exists():
-            shutil.rmtree(self.key_dir)
-    
-    @patch('historify.changelog.minisign_sign')
-    def test_changelog_init(self, mock_sign):
+    def test_changelog_init(self):
         """Test Changelog class initialization."""
         # Configure repository with minisign keys
-        config = RepositoryConfig(str(self.test_repo_path))
-        config.set("minisign.key", str(self.minisign_key))
-        config.set("minisign.pub", str(self.minisign_pub))
+        self.configure_minisign()
         
         # Initialize changelog
         changelog = Changelog(str(self.test_repo_path))
@@ -67,16 +62,27 @@ class TestLifecycleImplementation:
         # Verify CSV manager is initialized
         assert changelog.csv_manager is not None
     
-    @patch('historify.changelog.minisign_sign')
-    def test_start_initial(self, mock_sign):
-        """Test initial start command on new repository."""
-        # Set up mock
-        mock_sign.return_value = True
+    def test_get_current_and_latest_changelog(self):
+        """Test finding the open and latest changelogs from the changes directory."""
+        changelog = Changelog(str(self.test_repo_path))
+        changes_dir = self.test_repo_path / "changes"
         
+        assert changelog.get_current_changelog() is None
+        assert changelog.get_latest_changelog() is None
+        
+        for name in ["changelog-2025-04-20.csv", "changelog-2025-04-21.csv", "changelog-2025-04-22.csv"]:
+            (changes_dir / name).touch()
+        (changes_dir / "changelog-2025-04-20.csv.minisig").touch()
+        (changes_dir / "changelog-2025-04-22.csv.minisig").touch()
+        (changes_dir / "notes.txt").touch()
+        
+        assert changelog.get_current_changelog() == changes_dir / "changelog-2025-04-21.csv"
+        assert changelog.get_latest_changelog() == changes_dir / "changelog-2025-04-22.csv"
+    
+    def test_start_initial(self, sign_calls):
+        """Test initial start command on new repository."""
         # Configure repository with minisign keys
-        config = RepositoryConfig(str(self.test_repo_path))
-        config.set("minisign.key", str(self.minisign_key))
-        config.set("minisign.pub", str(self.minisign_pub))
+        self.configure_minisign()
         
         # Initialize changelog
         changelog = Changelog(str(self.test_repo_path))
@@ -87,76 +93,72 @@ class TestLifecycleImplementation:
         assert success is True
         assert "Signed seed file and created first changelog" in message
         
-        # Verify a new changelog was created
-        changelog_files = list(self.test_repo_path.glob("changes/changelog-*.csv"))
-        assert len(changelog_files) == 1
+        # Verify a new changelog was created and is the open one
+        changelog_file = changelog.get_current_changelog()
+        assert changelog_file is not None and changelog_file.exists()
         
         # Verify minisign was called with the seed file
-        assert mock_sign.call_count == 1
-        args, kwargs = mock_sign.call_args
+        assert len(sign_calls) == 1
+        args, kwargs = sign_calls[0]
         assert str(self.test_repo_path / "db" / "seed.bin") in args
         assert str(self.minisign_key) in args
         assert kwargs.get('password') is None
         
         # Check changelog content - verify it contains closing record
-        with open(changelog_files[0], "r", newline="") as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-            assert len(rows) == 1
-            assert rows[0]["transaction_type"] == "closing"
-            assert rows[0]["path"] == "db/seed.bin"
-            assert rows[0]["blake3"] != ""  # Check that the hash is present
+        with open(changelog_file, "r", newline="") as f:
+            header, *rows = csv.reader(f)
+        assert len(rows) == 1
+        row = dict(zip(header, rows[0]))
+        assert row["transaction_type"] == "closing"
+        assert row["path"] == "db/seed.bin"
+        assert row["blake3"] != ""  # Check that the hash is present
     
-    @patch('historify.changelog.minisign_sign')
-    @patch('historify.changelog.Changelog.create_new_changelog')
-    @patch('historify.changelog.Changelog.write_closing_transaction')
-    @patch('historify.csv_manager.CSVManager.update_integrity_info')
-    def test_closing_and_new_start(self, mock_update, mock_write, mock_create, mock_sign):
+    def test_closing_and_new_start(self, sign_calls):
         """Test closing current changelog and starting a new one using extensive mocking."""
-        # Set up all mocks
-        mock_sign.return_value = True
-        mock_create.return_value = Path("mock_changelog.csv")
-        mock_write.return_value = True
-        mock_update.return_value = True
-        
-        # Create a mock for get_current_changelog that returns different values on consecutive calls
-        with patch('historify.changelog.Changelog.get_current_changelog') as mock_get_current:
-            # First call returns None (no open changelog)
-            # Second call returns a mock path (after first start)
-            mock_get_current.side_effect = [None, Path("mock_changelog1.csv")]
+        with ExitStack() as stack:
+            # Patch the class attributes directly; no dotted-path lookups
+            mock_create = stack.enter_context(
+                patch.object(Changelog, "create_new_changelog", return_value=Path("mock_changelog.csv"))
+            )
+            mock_write = stack.enter_context(
+                patch.object(Changelog, "write_closing_transaction", return_value=True)
+            )
+            stack.enter_context(patch.object(CSVManager, "update_integrity_info", return_value=True))
             
-            # Configure repository with minisign keys
-            config = RepositoryConfig(str(self.test_repo_path))
-            config.set("minisign.key", str(self.minisign_key))
-            config.set("minisign.pub", str(self.minisign_pub))
+            # Open changelog returned once the first start has run
+            open_changelog = self.tmp_path / "mock_changelog1.csv"
+            open_changelog.touch()
             
-            # First start
-            changelog = Changelog(str(self.test_repo_path))
-            first_result, first_message = changelog.start_closing()
-            
-            # Verify first start worked
-            assert first_result is True
-            assert "created first changelog" in first_message
-            
-        # Now test second start with different mock setup
-        with patch('historify.changelog.Changelog.get_current_changelog') as mock_get_current:
-            mock_get_current.return_value = Path("mock_changelog1.csv")
-            
-            # Reset sign mock to track new calls
-            mock_sign.reset_mock()
-            
-            # Second start
-            changelog2 = Changelog(str(self.test_repo_path))
-            success, message = changelog2.start_closing()
-            
-            # Verify second start
-            assert success is True
-            assert "Signed" in message
+            # First start: no open changelog yet
+            with patch.object(Changelog, "get_current_changelog", return_value=None):
+                # Configure repository with minisign keys
+                self.configure_minisign()
+                
+                # First start
+                changelog = Changelog(str(self.test_repo_path))
+                first_result, first_message = changelog.start_closing()
+                
+                # Verify first start worked
+                assert first_result is True
+                assert "created first changelog" in first_message
             
-            # Verify methods were called
-            mock_sign.assert_called_once()
-            mock_create.assert_called()
-            mock_write.assert_called()
+            # Second start: the changelog opened by the first start is closed
+            with patch.object(Changelog, "get_current_changelog", return_value=open_changelog):
+                # Reset recorded sign calls to track new calls
+                sign_calls.clear()
+                
+                # Second start
+                changelog2 = Changelog(str(self.test_repo_path))
+                success, message = changelog2.start_closing()
+                
+                # Verify second start
+                assert success is True
+                assert "Signed" in message
+                
+                # Verify methods were called
+                assert len(sign_calls) == 1
+                mock_create.assert_called()
+                mock_write.assert_called()
 
     @patch('historify.cli_lifecycle.cli_verify_command')
     @patch('historify.cli_lifecycle.Changelog')
@@ -164,42 +166,36 @@ class TestLifecycleImplementation:
         """Test CLI start command."""
         # Set up mocks
         mock_verify_command.return_value = 0  # Verification succeeds
-        mock_changelog = MagicMock()
+        mock_changelog = changelog_mock()
         mock_changelog.start_closing.return_value = (True, "Success message")
         mock_changelog.minisign_key = None  # No need for password prompt
         mock_changelog_class.return_value = mock_changelog
         
-        with self.runner.isolated_filesystem():
-            # Create a simple repository structure to pass basic validation
-            os.makedirs("repo_dir/db")
-            os.makedirs("repo_dir/changes")
-            with open("repo_dir/db/config", "w") as f:
-                f.write("[repository]\nname = test-repo\n")
-                # Add hash algorithms config to pass verification
-                f.write("[hash]\nalgorithms = blake3,sha256\n")
+        # Create a simple repository structure to pass basic validation
+        repo_dir = write_minimal_repository(self.tmp_path / "repo_dir")
+        
+        # Temporarily remove HISTORIFY_PASSWORD from environment if it exists
+        old_env = os.environ.get("HISTORIFY_PASSWORD")
+        if "HISTORIFY_PASSWORD" in os.environ:
+            del os.environ["HISTORIFY_PASSWORD"]
+        
+        try:
+            # Run start command
+            result = self.runner.invoke(start_transaction, [str(repo_dir)])
             
-            # Temporarily remove HISTORIFY_PASSWORD from environment if it exists
-            old_env = os.environ.get("HISTORIFY_PASSWORD")
-            if "HISTORIFY_PASSWORD" in os.environ:
-                del os.environ["HISTORIFY_PASSWORD"]
+            assert result.exit_code == 0
+            assert "Performing implicit verification" in result.output
+            assert "Starting new transaction period" in result.output
+            assert "Success" in result.output
             
-            try:
-                # Run start command
-                result = self.runner.invoke(start_transaction, ["repo_dir"])
-                
-                assert result.exit_code == 0
-                assert "Performing implicit verification" in result.output
-                assert "Starting new transaction period" in result.output
-                assert "Success" in result.output
-                
-                # Verify the methods were called - now using exact string match
-                mock_verify_command.assert_called_once_with("repo_dir", full_chain=False)
-                mock_changelog_class.assert_called_once()
-                mock_changelog.start_closing.assert_called_once_with(None)
-            finally:
-                # Restore environment
-                if old_env is not None:
-                    os.environ["HISTORIFY_PASSWORD"] = old_env
+            # Verify the methods were called - now using exact string match
+            mock_verify_command.assert_called_once_with(str(repo_dir), full_chain=False)
+            mock_changelog_class.assert_called_once()
+            mock_changelog.start_closing.assert_called_once_with(None)
+        finally:
+            # Restore environment
+            if old_env is not None:
+                os.environ["HISTORIFY_PASSWORD"] = old_env
     
     @patch('historify.cli_lifecycle.cli_verify_command')
     @patch('historify.cli_lifecycle.Changelog')
@@ -207,40 +203,34 @@ class TestLifecycleImplementation:
         """Test CLI start command with password from environment variable."""
         # Set up mocks
         mock_verify_command.return_value = 0  # Verification succeeds
-        mock_changelog = MagicMock()
+        mock_changelog = changelog_mock()
         mock_changelog.start_closing.return_value = (True, "Success message")
         mock_changelog.minisign_key = "some_key_path"  # Path that will trigger password check
         mock_changelog_class.return_value = mock_changelog
         
-        with self.runner.isolated_filesystem():
-            # Create a simple repository structure to pass basic validation
-            os.makedirs("repo_dir/db")
-            os.makedirs("repo_dir/changes")
-            with open("repo_dir/db/config", "w") as f:
-                f.write("[repository]\nname = test-repo\n")
-                # Add hash algorithms config to pass verification
-                f.write("[hash]\nalgorithms = blake3,sha256\n")
+        # Create a simple repository structure to pass basic validation
+        repo_dir = write_minimal_repository(self.tmp_path / "repo_dir")
+        
+        # Set environment variable
+        old_env = os.environ.get("HISTORIFY_PASSWORD")
+        os.environ["HISTORIFY_PASSWORD"] = "test123"
+        
+        try:
+            # Run start command
+            result = self.runner.invoke(start_transaction, [str(repo_dir)])
             
-            # Set environment variable
-            old_env = os.environ.get("HISTORIFY_PASSWORD")
-            os.environ["HISTORIFY_PASSWORD"] = "test123"
+            assert result.exit_code == 0
+            assert "Success" in result.output
             
-            try:
-                # Run start command
-                result = self.runner.invoke(start_transaction, ["repo_dir"])
-                
-                assert result.exit_code == 0
-                assert "Success" in result.output
-                
-                # Verify the changelog method was called with the password from env
-                mock_changelog_class.assert_called_once()
-                mock_changelog.start_closing.assert_called_once_with("test123")
-            finally:
-                # Restore original environment
-                if old_env is not None:
-                    os.environ["HISTORIFY_PASSWORD"] = old_env
-                else:
-                    os.environ.pop("HISTORIFY_PASSWORD", None)
+            # Verify the changelog method was called with the password from env
+            mock_changelog_class.assert_called_once()
+            mock_changelog.start_closing.assert_called_once_with("test123")
+        finally:
+            # Restore original environment
+            if old_env is not None:
+                os.environ["HISTORIFY_PASSWORD"] = old_env
+            else:
+                os.environ.pop("HISTORIFY_PASSWORD", None)
     
     @patch('historify.cli_lifecycle.cli_verify_command')
     @patch('historify.cli_lifecycle.Changelog')
@@ -248,64 +238,54 @@ class TestLifecycleImplementation:
         """Test CLI closing command."""
         # Set up mocks
         mock_verify_command.return_value = 0  # Verification succeeds
-        mock_changelog = MagicMock()
+        mock_changelog = changelog_mock()
         mock_changelog.start_closing.return_value = (True, "Success message")
         mock_changelog.minisign_key = None  # No need for password prompt
         mock_changelog_class.return_value = mock_changelog
         
-        with self.runner.isolated_filesystem():
-            # Create a simple repository structure to pass basic validation
-            os.makedirs("repo_dir/db")
-            os.makedirs("repo_dir/changes")
-            with open("repo_dir/db/config", "w") as f:
-                f.write("[repository]\nname = test-repo\n")
-                # Add hash algorithms config to pass verification
-                f.write("[hash]\nalgorithms = blake3,sha256\n")
+        # Create a simple repository structure to pass basic validation
+        repo_dir = write_minimal_repository(self.tmp_path / "repo_dir")
+        
+        # Temporarily remove HISTORIFY_PASSWORD from environment if it exists
+        old_env = os.environ.get("HISTORIFY_PASSWORD")
+        if "HISTORIFY_PASSWORD" in os.environ:
+            del os.environ["HISTORIFY_PASSWORD"]
+        
+        try:
+            # Run closing command
+            result = self.runner.invoke(closing, [str(repo_dir)])
             
-            # Temporarily remove HISTORIFY_PASSWORD from environment if it exists
-            old_env = os.environ.get("HISTORIFY_PASSWORD")
-            if "HISTORIFY_PASSWORD" in os.environ:
-                del os.environ["HISTORIFY_PASSWORD"]
+            assert result.exit_code == 0
+            assert "Success" in result.output
             
-            try:
-                # Run closing command
-                result = self.runner.invoke(closing, ["repo_dir"])
-                
-                assert result.exit_code == 0
-                assert "Success" in result.output
+            # Verify the verification and changelog methods were called
+            mock_verify_command.assert_called_once_with(str(repo_dir), full_chain=False)
+            mock_changelog_class.assert_called_once()
+            mock_changelog.start_closing.assert_called_once_with(None)
+        finally:
+            # Restore environment
+            if old_env is not None:
+                os.environ["HISTORIFY_PASSWORD"] = old_env
                 
-                # Verify the verification and changelog methods were called
-                mock_verify_command.assert_called_once_with("repo_dir", full_chain=False)
-                mock_changelog_class.assert_called_once()
-                mock_changelog.start_closing.assert_called_once_with(None)
-            finally:
-                # Restore environment
-                if old_env is not None:
-                    os.environ["HISTORIFY_PASSWORD"] = old_env
-                    
     @patch('historify.cli_lifecycle.cli_verify_command')
     @patch('historify.cli_lifecycle.Changelog')
     def test_cli_start_with_verification_failure(self, mock_changelog_class, mock_verify_command):
         """Test CLI start command with verification failure."""
         # Set up verify mock to fail
         mock_verify_command.return_value = 3  # Verification fails
-        mock_changelog = MagicMock()
+        mock_changelog = changelog_mock()
         mock_changelog_class.return_value = mock_changelog
         
-        with self.runner.isolated_filesystem():
-            # Create a simple repository structure
-            os.makedirs("repo_dir/db")
-            os.makedirs("repo_dir/changes")
-            with open("repo_dir/db/config", "w") as f:
-                f.write("[repository]\nname = test-repo\n")
-            
-            # Run start command
-            result = self.runner.invoke(start_transaction, ["repo_dir"])
-            
-            # Should fail because verification failed
-            assert result.exit_code != 0
-            assert "Verification failed" in result.output
-            
-            # Verify methods were called/not called
-            mock_verify_command.assert_called_once()
-            mock_changelog.start_closing.assert_not_called()  # Should not reach this point
\ No newline at end of file
+        # Create a simple repository structure
+        repo_dir = write_minimal_repository(self.tmp_path / "repo_dir", hash_config=False)
+        
+        # Run start command
+        result = self.runner.invoke(start_transaction, [str(repo_dir)])
+        
+        # Should fail because verification failed
+        assert result.exit_code != 0
+        assert "Verification failed" in result.output
+        
+        # Verify methods were called/not called
+        mock_verify_command.assert_called_once()
+        mock_changelog.start_closing.assert_not_called()  # Should not reach this point
\ No newline at end of file
@@ -2,43 +2,25 @@
 Tests for the main CLI functionality.
 """
 import pytest
-import os
-from pathlib import Path
-from click.testing import CliRunner
 from unittest.mock import patch
 
 from historify.cli import scan, verify, status
 
-def test_scan_command():
-    """Test the scan command."""
-    runner = CliRunner()
-    with runner.isolated_filesystem():
-        # Create a minimal repository structure for the test
-        os.makedirs("repo_dir/db")
-        os.makedirs("repo_dir/changes")
+@pytest.mark.parametrize("command, handler, args, expected_args", [
+    (scan, "cli_scan_command", [], (None,)),
+    (scan, "cli_scan_command", ["--category", "documents"], ("documents",)),
+    (verify, "cli_verify_command", [], (False,)),
+    (verify, "cli_verify_command", ["--full-chain"], (True,)),
+    (status, "cli_status_command", [], (None,)),
+    (status, "cli_status_command", ["--category", "data"], ("data",)),
+], ids=["scan", "scan-category", "verify", "verify-full-chain", "status", "status-category"])
+def test_command_dispatch(runner, stub_repo, command, handler, args, expected_args):
+    """Test that each command passes its arguments to the command handler."""
+    repo_dir = str(stub_repo)
+    
+    # Mock the actual implementation; handlers that report an exit code succeed
+    with patch(f"historify.cli.{handler}", return_value=0) as mock_handler:
+        result = runner.invoke(command, [repo_dir, *args])
         
-        # Mock the actual scan implementation to avoid errors
-        with patch('historify.cli.cli_scan_command') as mock_scan_command:
-            mock_scan_command.return_value = None
-            
-            result = runner.invoke(scan, ["repo_dir"])
-            
-            assert result.exit_code == 0
-            mock_scan_command.assert_called_once_with("repo_dir", None)
-
-def test_scan_with_category():
-    """Test scan with category filter."""
-    runner = CliRunner()
-    with runner.isolated_filesystem():
-        # Create a minimal repository structure for the test
-        os.makedirs("repo_dir/db")
-        os.makedirs("repo_dir/changes")
-        
-        # Mock the actual scan implementation to avoid errors
-        with patch('historify.cli.cli_scan_command') as mock_scan_command:
-            mock_scan_command.return_value = None
-            
-            result = runner.invoke(scan, ["repo_dir", "--category", "documents"])
-            
-            assert result.exit_code == 0
-            mock_scan_command.assert_called_once_with("repo_dir", "documents")
\ No newline at end of file
+        assert result.exit_code == 0
+        mock_handler.assert_called_once_with(repo_dir, *expected_args)
@@ -5,39 +5,40 @@ Tests for the snapshot command implementation.
 import pytest
 import os
 import shutil
+import subprocess
 import tarfile
 import tempfile
 import click
 from pathlib import Path
-from click.testing import CliRunner
 from unittest.mock import patch, MagicMock
 
 from historify.cli import snapshot
-from historify.cli_snapshot import create_snapshot, handle_snapshot_command, SnapshotError
-from historify.cli_init import init_repository
+from historify.cli_snapshot import create_snapshot, handle_snapshot_command, write_tar_gz, SnapshotError
 from historify.config import RepositoryConfig
+from tests.helpers import copy_template_repository
 
 class TestSnapshotImplementation:
     """Test the snapshot command implementation."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.runner = CliRunner()
-        self.test_repo_path = Path("test_repo_snapshot").absolute()
+    @pytest.fixture(autouse=True)
+    def setup_repo(self, tmp_path, template_repo):
+        """Set up test environment in a per-test temporary directory."""
+        self.test_repo_path = tmp_path / "test_repo_snapshot"
         
-        # Initialize a test repository
-        if not self.test_repo_path.exists():
-            init_repository(str(self.test_repo_path), "test-repo")
+        # Copy the session-wide template repository
+        copy_template_repository(template_repo, self.test_repo_path)
         
         # Create some sample files in the repository
         test_file = self.test_repo_path / "db" / "test_file.txt"
         with open(test_file, "w") as f:
             f.write("Test content")
             
+        # Snapshot output goes to a per-test directory, not the working directory
+        self.output_dir = tmp_path / "output_dir"
+        
         # Create an external category
-        self.external_dir = Path("external_category").absolute()
-        if not self.external_dir.exists():
-            self.external_dir.mkdir(parents=True)
+        self.external_dir = tmp_path / "external_category"
+        self.external_dir.mkdir()
             
         # Add a test file to the external category
         with open(self.external_dir / "external_file.txt", "w") as f:
@@ -47,13 +48,6 @@ class TestSnapshotImplementation:
         config = RepositoryConfig(str(self.test_repo_path))
         config.set("category.external.path", str(self.external_dir))
     
-    def teardown_method(self):
-        """Clean up test environment."""
-        if self.test_repo_path.exists():
-            shutil.rmtree(self.test_repo_path)
-        if self.external_dir.exists():
-            shutil.rmtree(self.external_dir)
-    
     @patch('historify.cli_snapshot.cli_verify_command')
     def test_create_snapshot(self, mock_verify):
         """Test creating a snapshot archive."""
@@ -249,6 +243,137 @@ class TestSnapshotImplementation:
             if Path(temp_path).exists():
                 Path(temp_path).unlink()
     
+    @pytest.mark.parametrize("external_tools", [True, False], ids=["pipeline", "tarfile"])
+    def test_write_tar_gz(self, tmp_path, monkeypatch, external_tools):
+        """Test that the tar pipeline and the tarfile fallback write the same members."""
+        if not external_tools:
+            monkeypatch.setattr("historify.cli_snapshot.shutil.which", lambda name: None)
+        
+        archive_path = tmp_path / "archive.tar.gz"
+        write_tar_gz(self.test_repo_path, archive_path)
+        
+        with tarfile.open(archive_path, "r:gz") as tar:
+            names = set(tar.getnames())
+        
+        root = self.test_repo_path.name
+        assert f"{root}/db/config" in names
+        assert f"{root}/db/seed.bin" in names
+        assert f"{root}/db/test_file.txt" in names
+    
+    def test_write_tar_gz_missing_source(self, tmp_path):
+        """Test that a failing tar pipeline raises SnapshotError."""
+        if not shutil.which("tar"):
+            pytest.skip("tar not installed")
+        
+        with pytest.raises(SnapshotError, match="tar failed"):
+            write_tar_gz(tmp_path / "missing", tmp_path / "archive.tar.gz")
+    
+    def test_write_tar_gz_dash_name(self, tmp_path):
+        """Test archiving a directory whose name starts with a dash."""
+        source = tmp_path / "-repo"
+        source.mkdir()
+        (source / "file.txt").write_text("content")
+        
+        archive_path = tmp_path / "archive.tar.gz"
+        write_tar_gz(source, archive_path)
+        
+        with tarfile.open(archive_path, "r:gz") as tar:
+            assert "-repo/file.txt" in tar.getnames()
+    
+    def test_write_tar_gz_sorted_members(self, tmp_path):
+        """Test that members are stored in name order like tarfile.add()."""
+        source = tmp_path / "tree"
+        source.mkdir()
+        for name in ("c.txt", "a.txt", "b.txt"):
+            (source / name).write_text(name)
+        
+        archive_path = tmp_path / "archive.tar.gz"
+        write_tar_gz(source, archive_path)
+        
+        with tarfile.open(archive_path, "r:gz") as tar:
+            assert tar.getnames() == ["tree", "tree/a.txt", "tree/b.txt", "tree/c.txt"]
+    
+    def test_write_tar_gz_files_changed(self, tmp_path, monkeypatch):
+        """Test that tar exit status 1 (files changed while read) is not fatal."""
+        if not shutil.which("gzip"):
+            pytest.skip("gzip not installed")
+        
+        # A GNU tar that reports a changed file
+        self._install_fake_tar(tmp_path, monkeypatch, "tar (GNU tar) 1.35")
+        
+        write_tar_gz(self.test_repo_path, tmp_path / "archive.tar.gz")
+        
+        assert (tmp_path / "archive.tar.gz").exists()
+    
+    def test_write_tar_gz_non_gnu_exit_1(self, tmp_path, monkeypatch):
+        """Test that tar exit status 1 is fatal for tars other than GNU tar."""
+        if not shutil.which("gzip"):
+            pytest.skip("gzip not installed")
+        
+        # bsdtar exits with 1 on fatal errors
+        self._install_fake_tar(tmp_path, monkeypatch, "bsdtar 3.7.2 - libarchive 3.7.2")
+        
+        with pytest.raises(SnapshotError, match="tar failed"):
+            write_tar_gz(self.test_repo_path, tmp_path / "archive.tar.gz")
+    
+    def _install_fake_tar(self, tmp_path, monkeypatch, version):
+        """Put a tar on the path that prints `version` and otherwise exits with 1."""
+        fake_tar = tmp_path / "tar"
+        fake_tar.write_text(
+            "#!/bin/sh\n"
+            f"if [ \"$1\" = --version ]; then echo '{version}'; exit 0; fi\n"
+            "echo 'file changed as we read it' >&2\n"
+            "exit 1\n"
+        )
+        fake_tar.chmod(0o755)
+        
+        real_which = shutil.which
+        monkeypatch.setattr(
+            "historify.cli_snapshot.shutil.which",
+            lambda name: str(fake_tar) if name == "tar" else real_which(name)
+        )
+    
+    @patch('historify.cli_snapshot.cli_verify_command')
+    def test_create_snapshot_output_inside_repo(self, mock_verify):
+        """Test that a snapshot written inside the repository does not contain itself."""
+        mock_verify.return_value = 0
+        output_path = self.test_repo_path / "out.tar.gz"
+        
+        create_snapshot(str(self.test_repo_path), str(output_path), "out")
+        
+        with tarfile.open(output_path, "r:gz") as tar:
+            names = tar.getnames()
+        
+        root = self.test_repo_path.name
+        assert f"{root}/db/test_file.txt" in names
+        assert f"{root}/out.tar.gz" not in names
+    
+    def test_write_tar_gz_compressor_fails_to_start(self, tmp_path, monkeypatch):
+        """Test that tar is reaped when the compressor cannot be started."""
+        if not shutil.which("tar"):
+            pytest.skip("tar not installed")
+        
+        started = []
+        real_popen = subprocess.Popen
+        
+        def recording_popen(*args, **kwargs):
+            process = real_popen(*args, **kwargs)
+            started.append(process)
+            return process
+        
+        monkeypatch.setattr("historify.cli_snapshot.subprocess.Popen", recording_popen)
+        monkeypatch.setattr(
+            "historify.cli_snapshot._compressor_command",
+            lambda: [str(tmp_path / "missing-compressor")]
+        )
+        
+        with pytest.raises(FileNotFoundError):
+            write_tar_gz(self.test_repo_path, tmp_path / "archive.tar.gz")
+        
+        # Only tar was started, and it has been waited on
+        assert len(started) == 1
+        assert started[0].returncode is not None
+    
     @patch('historify.cli_snapshot.create_snapshot')
     def test_handle_snapshot_command(self, mock_create):
         """Test handling the snapshot command."""
@@ -256,7 +381,7 @@ class TestSnapshotImplementation:
         mock_create.return_value = True
         
         # Handle the snapshot command with the new parameters
-        handle_snapshot_command("output_dir", str(self.test_repo_path), name="test-repo")
+        handle_snapshot_command(str(self.output_dir), str(self.test_repo_path), name="test-repo")
         
         # Verify create_snapshot was called correctly
         mock_create.assert_called_once()
@@ -277,7 +402,7 @@ class TestSnapshotImplementation:
         mock_create.return_value = True
         
         # Handle the snapshot command with full option
-        handle_snapshot_command("output_dir", str(self.test_repo_path), name="test-repo", full=True)
+        handle_snapshot_command(str(self.output_dir), str(self.test_repo_path), name="test-repo", full=True)
         
         # Verify create_snapshot was called correctly
         mock_create.assert_called_once()
@@ -295,7 +420,7 @@ class TestSnapshotImplementation:
         mock_create.return_value = True
         
         # Handle the snapshot command with media flag
-        handle_snapshot_command("output_dir", str(self.test_repo_path), name="test-repo", media=True)
+        handle_snapshot_command(str(self.output_dir), str(self.test_repo_path), name="test-repo", media=True)
         
         # Verify create_snapshot was called correctly
         mock_create.assert_called_once()
@@ -313,7 +438,7 @@ class TestSnapshotImplementation:
         mock_create.return_value = True
         
         # Handle the snapshot command with media value
-        handle_snapshot_command("output_dir", str(self.test_repo_path), name="test-repo", media="bd-r")
+        handle_snapshot_command(str(self.output_dir), str(self.test_repo_path), name="test-repo", media="bd-r")
         
         # Verify create_snapshot was called correctly
         mock_create.assert_called_once()
@@ -332,7 +457,7 @@ class TestSnapshotImplementation:
         
         # Handle the snapshot command
         with pytest.raises(click.Abort):
-            handle_snapshot_command("output_dir", str(self.test_repo_path), name="test-repo")
+            handle_snapshot_command(str(self.output_dir), str(self.test_repo_path), name="test-repo")
         
         # Verify create_snapshot was called
         mock_create.assert_called_once()
@@ -4,33 +4,28 @@ Tests for the status command implementation.
 import pytest
 import os
 import csv
-import shutil
-from pathlib import Path
-from click.testing import CliRunner
 from unittest.mock import patch, MagicMock
 
 from historify.cli import status
 from historify.cli_status import (
-    handle_status_command, 
+    handle_status_command,
     get_category_status,
     get_changelog_status,
-    cli_status_command,
-    StatusError
+    cli_status_command
 )
 from historify.config import RepositoryConfig
-from historify.cli_init import init_repository
+from tests.helpers import copy_template_repository
 
 class TestStatusImplementation:
     """Test the status command implementation."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.runner = CliRunner()
-        self.test_repo_path = Path("test_repo_status").absolute()
+    @pytest.fixture(autouse=True)
+    def setup_repo(self, tmp_path, template_repo):
+        """Set up test environment in a per-test temporary directory."""
+        self.test_repo_path = tmp_path / "test_repo_status"
         
-        # Initialize a test repository
-        if not self.test_repo_path.exists():
-            init_repository(str(self.test_repo_path), "test-repo")
+        # Copy the session-wide template repository
+        copy_template_repository(template_repo, self.test_repo_path)
         
         # Create some sample data directories and files
         self.docs_dir = self.test_repo_path / "docs"
@@ -66,11 +61,6 @@ class TestStatusImplementation:
         config.set("category.docs.path", "docs")
         config.set("repository.created", "2025-04-22T10:00:00")
     
-    def teardown_method(self):
-        """Clean up test environment."""
-        if self.test_repo_path.exists():
-            shutil.rmtree(self.test_repo_path)
-    
     def test_get_category_status(self):
         """Test getting status for a category."""
         # Test with existing category
@@ -4,11 +4,8 @@ Tests for the verify command implementation.
 import pytest
 import os
 import csv
-import shutil
-from pathlib import Path
 from datetime import datetime, UTC
-from click.testing import CliRunner
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, Mock
 
 from historify.cli import verify
 from historify.cli_verify import (
@@ -24,36 +21,22 @@ from historify.cli_verify import (
 )
 from historify.config import RepositoryConfig
 from historify.changelog import Changelog
-from historify.cli_init import init_repository
 from historify.hash import hash_file
+from tests.helpers import copy_template_repository
 
 class TestVerifyImplementation:
     """Test the verify command implementation."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.runner = CliRunner()
-        self.test_repo_path = Path("test_repo_verify").absolute()
-        
-        # Initialize a test repository
-        if not self.test_repo_path.exists():
-            init_repository(str(self.test_repo_path), "test-repo")
-        
-        # Create test minisign key files
-        self.key_dir = Path("test_keys_verify").absolute()
-        self.key_dir.mkdir(parents=True, exist_ok=True)
-        
-        self.minisign_key = self.key_dir / "historify.key"
-        self.minisign_pub = self.key_dir / "historify.pub"
-        
-        # Create mock minisign key files
-        with open(self.minisign_key, "w") as f:
-            f.write("untrusted comment: minisign unencrypted secret key\n")
-            f.write("TESTKEY123456789\n")
-        
-        with open(self.minisign_pub, "w") as f:
-            f.write("untrusted comment: minisign public key\n")
-            f.write("TESTPUB987654321\n")
+    @pytest.fixture(autouse=True)
+    def setup_repo(self, tmp_path, minisign_keys, template_repo):
+        """Set up test environment in a per-test temporary directory."""
+        self.test_repo_path = tmp_path / "test_repo_verify"
+        
+        # Copy the session-wide template repository
+        copy_template_repository(template_repo, self.test_repo_path)
+        
+        # Share the session-wide placeholder minisign keys
+        self.minisign_key, self.minisign_pub = minisign_keys
             
         # Create a changes directory
         self.changes_dir = self.test_repo_path / "changes"
@@ -80,13 +63,6 @@ class TestVerifyImplementation:
         open(self.changelog2.with_suffix(".csv.minisig"), "w").close()
         # No signature for changelog3, simulating an open changelog
     
-    def teardown_method(self):
-        """Clean up test environment."""
-        if self.test_repo_path.exists():
-            shutil.rmtree(self.test_repo_path)
-        if self.key_dir.exists():
-            shutil.rmtree(self.key_dir)
-    
     def _create_test_changelog(self, filepath, entries=None):
         """Create a test changelog file with the specified entries."""
         with open(filepath, "w", newline="") as f:
@@ -120,7 +96,7 @@ class TestVerifyImplementation:
         """Test verifying repository configuration."""
         # Mock RepositoryConfig.check method
         with patch('historify.cli_verify.RepositoryConfig') as mock_config_class:
-            mock_config = MagicMock()
+            mock_config = Mock(spec=RepositoryConfig)
             mock_config.check.return_value = []  # No issues
             mock_config_class.return_value = mock_config
             
@@ -257,12 +233,14 @@ class TestVerifyImplementation:
             verify_changelog_hash_chain(wrong_type_changelog, "test_hash")
     
     @patch('historify.cli_verify.hash_file')
-    @patch('historify.cli_verify.minisign_verify')
-    def test_rebuild_integrity_csv(self, mock_minisign_verify, mock_hash_file):
+    @patch('historify.cli_verify.minisign_verify_many')
+    def test_rebuild_integrity_csv(self, mock_minisign_verify_many, mock_hash_file):
         """Test rebuilding the integrity CSV file."""
         # Setup mocks
         mock_hash_file.return_value = {"blake3": "test_hash_value"}
-        mock_minisign_verify.return_value = (True, "Signature verified")
+        mock_minisign_verify_many.side_effect = lambda files, pubkey: {
+            f: (True, "Signature verified") for f in files
+        }
         
         # Test rebuilding
         result = rebuild_integrity_csv(str(self.test_repo_path))
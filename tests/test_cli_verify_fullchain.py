@@ -5,48 +5,31 @@ import pytest
 import os
 import csv
 import shutil
-from pathlib import Path
-from click.testing import CliRunner
 from unittest.mock import patch, MagicMock
 
 from historify.cli import verify
 from historify.cli_verify import (
     verify_full_chain,
-    handle_verify_command,
-    cli_verify_command
+    handle_verify_command
 )
-from historify.cli_init import init_repository
 from historify.config import RepositoryConfig
 from historify.changelog import Changelog
 from historify.hash import hash_file
+from tests.helpers import copy_template_repository
 
 class TestFullChainVerification:
     """Test the full chain verification functionality."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.runner = CliRunner()
-        self.test_repo_path = Path("test_repo_full_chain").absolute()
-        
-        # Initialize a test repository
-        if not self.test_repo_path.exists():
-            init_repository(str(self.test_repo_path), "test-repo")
-        
-        # Create test minisign key files
-        self.key_dir = Path("test_keys_verification").absolute()
-        self.key_dir.mkdir(parents=True, exist_ok=True)
-        
-        self.minisign_key = self.key_dir / "historify.key"
-        self.minisign_pub = self.key_dir / "historify.pub"
-        
-        # Create mock minisign key files
-        with open(self.minisign_key, "w") as f:
-            f.write("untrusted comment: minisign unencrypted secret key\n")
-            f.write("TESTKEY123456789\n")
-        
-        with open(self.minisign_pub, "w") as f:
-            f.write("untrusted comment: minisign public key\n")
-            f.write("TESTPUB987654321\n")
+    @pytest.fixture(autouse=True)
+    def setup_repo(self, tmp_path, minisign_keys, template_repo):
+        """Set up test environment in a per-test temporary directory."""
+        self.test_repo_path = tmp_path / "test_repo_full_chain"
+        
+        # Copy the session-wide template repository
+        copy_template_repository(template_repo, self.test_repo_path)
+        
+        # Share the session-wide placeholder minisign keys
+        self.minisign_key, self.minisign_pub = minisign_keys
             
         # Create repository structure
         self.db_dir = self.test_repo_path / "db"
@@ -63,13 +46,6 @@ class TestFullChainVerification:
         with open(self.seed_sig_file, "w") as f:
             f.write("Dummy seed signature")
     
-    def teardown_method(self):
-        """Clean up test environment."""
-        if self.test_repo_path.exists():
-            shutil.rmtree(self.test_repo_path)
-        if self.key_dir.exists():
-            shutil.rmtree(self.key_dir)
-    
     def create_test_changelog(self, name, reference_path, reference_hash, add_signature=True):
         """
         Create a test changelog file with proper closing transaction.
@@ -172,7 +148,7 @@ class TestFullChainVerification:
         mock_minisign_verify.return_value = (True, "Signature verified")
         
         # Use a side effect to return different hash values for different files
-        def hash_side_effect(file_path):
+        def hash_side_effect(file_path, algorithms=None):
             if "changelog-2025-04-01.csv" in str(file_path):
                 return {"blake3": "hash_1"}
             elif "changelog-2025-04-10.csv" in str(file_path):
@@ -4,9 +4,6 @@ Tests for the CSV Manager implementation.
 import pytest
 import os
 import csv
-import shutil
-import tempfile
-from pathlib import Path
 from unittest.mock import patch, MagicMock, mock_open
 
 from historify.csv_manager import CSVManager, CSVError
@@ -14,9 +11,10 @@ from historify.csv_manager import CSVManager, CSVError
 class TestCSVManager:
     """Test the CSV Manager implementation."""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup_temp_dir(self, tmp_path):
         """Set up test environment."""
-        self.test_dir = Path(tempfile.mkdtemp())
+        self.test_dir = tmp_path
         self.csv_manager = CSVManager(str(self.test_dir))
         
         # Use custom field names for test CSV
@@ -30,10 +28,6 @@ class TestCSVManager:
             writer.writerow({"key": "test1", "value": "value1"})
             writer.writerow({"key": "test2", "value": "value2"})
     
-    def teardown_method(self):
-        """Clean up test environment."""
-        shutil.rmtree(self.test_dir)
-    
     def test_init(self):
         """Test initialization of CSV Manager."""
         assert self.csv_manager.repo_path == self.test_dir
@@ -76,6 +70,35 @@ class TestCSVManager:
             assert entries[2]["key"] == "test3"
             assert entries[2]["value"] == "value3"
     
+    def test_append_entry_reuses_fieldnames(self):
+        """Test that repeated appends read the header only once."""
+        with patch('historify.csv_manager.CSVManager._lock_file'), \
+             patch('historify.csv_manager.CSVManager._unlock_file'), \
+             patch.object(self.csv_manager, '_get_fieldnames', wraps=self.csv_manager._get_fieldnames) as mock_fieldnames:
+            self.csv_manager.append_entry(self.test_csv, {"key": "test3", "value": "value3"})
+            self.csv_manager.append_entry(self.test_csv, {"key": "test4", "value": "value4"})
+            
+            assert mock_fieldnames.call_count == 1
+            
+            entries = self.csv_manager.read_entries(self.test_csv)
+            assert [entry["key"] for entry in entries] == ["test1", "test2", "test3", "test4"]
+    
+    def test_append_entries(self):
+        """Test appending several entries in one call."""
+        with patch('historify.csv_manager.CSVManager._lock_file'), \
+             patch('historify.csv_manager.CSVManager._unlock_file'):
+            count = self.csv_manager.append_entries(self.test_csv, [
+                {"key": "test3", "value": "value3"},
+                {"key": "test4"}
+            ])
+            
+            assert count == 2
+            assert self.csv_manager.append_entries(self.test_csv, []) == 0
+            
+            entries = self.csv_manager.read_entries(self.test_csv)
+            assert [entry["key"] for entry in entries] == ["test1", "test2", "test3", "test4"]
+            assert entries[3]["value"] == ""
+    
     def test_append_entry_nonexistent_file(self):
         """Test appending an entry to a non-existent file."""
         with pytest.raises(CSVError, match="CSV file does not exist"):
@@ -195,6 +218,23 @@ class TestCSVManager:
             
             assert result is True
     
+    def test_integrity_info_roundtrip(self):
+        """Test that repeated updates keep one row per changelog file."""
+        (self.test_dir / "db").mkdir(exist_ok=True)
+        
+        for name in ("a.csv", "b.csv", "a.csv"):
+            assert self.csv_manager.update_integrity_info(
+                name, f"hash-{name}", f"{name}.minisig", True, "2025-04-22 12:00:00 UTC"
+            )
+        
+        entries = self.csv_manager.read_entries(self.test_dir / "db" / "integrity.csv")
+        assert [entry["changelog_file"] for entry in entries] == ["b.csv", "a.csv"]
+        
+        # A fresh manager reads the same state from disk
+        info = CSVManager(str(self.test_dir)).get_integrity_info("a.csv")
+        assert info["blake3"] == "hash-a.csv"
+        assert self.csv_manager.get_integrity_info("missing.csv") is None
+    
     def test_get_integrity_info(self):
         """Test getting integrity information."""
         # Create the db directory
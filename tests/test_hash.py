@@ -1,11 +1,16 @@
 import pytest
 import os
+import hashlib
 import tempfile
 from pathlib import Path
 from historify.hash import (
     get_blake3_hash,
+    get_blake3_hash_native,
+    get_blake3_hashes_many,
     get_sha256_hash,
+    get_sha256_hash_native,
     hash_file,
+    scan_file,
     HashError
 )
 
@@ -23,13 +28,60 @@ class TestHash:
             assert hash_value is not None
             assert len(hash_value) == 64  # Blake3 produces 32-byte (64-char) hex
             assert hash_value.islower()  # Ensure lowercase
-            
-            # Test with explicit tool path
-            hash_value2 = get_blake3_hash(tmp_path, tool_path="b3sum", use_native=False)
-            assert hash_value2 == hash_value
+            assert hash_value == get_blake3_hash_native(tmp_path)
             
         os.unlink(tmp_path)
     
+    def test_get_blake3_hash_native_large_file(self):
+        """Test that memory-mapped hashing matches hashing the raw bytes."""
+        blake3 = pytest.importorskip("blake3")
+        data = os.urandom(3 * 1024 * 1024 + 17)
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
+            tmp.write(data)
+            tmp_path = tmp.name
+        
+        try:
+            assert get_blake3_hash_native(tmp_path) == blake3.blake3(data).hexdigest()
+        finally:
+            os.unlink(tmp_path)
+    
+    def test_get_blake3_hashes_many(self, tmp_path):
+        """Test hashing several files in parallel."""
+        paths = []
+        for i in range(5):
+            path = tmp_path / f"file{i}.txt"
+            path.write_bytes(f"test data {i}".encode())
+            paths.append(path)
+        
+        hashes = get_blake3_hashes_many(paths, workers=2)
+        
+        assert list(hashes) == paths
+        for path in paths:
+            assert hashes[path] == get_blake3_hash(path)
+        
+        assert get_blake3_hashes_many([]) == {}
+        
+        with pytest.raises(HashError, match="File does not exist"):
+            get_blake3_hashes_many(paths + [tmp_path / "missing.txt"])
+    
+    def test_scan_file(self):
+        """Test single-pass stat and hashing."""
+        data = os.urandom(2 * 1024 * 1024 + 5)
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
+            tmp.write(data)
+            tmp_path = tmp.name
+        
+        try:
+            st, hashes = scan_file(tmp_path)
+            assert st.st_size == len(data)
+            assert hashes["blake3"] == get_blake3_hash(tmp_path)
+            assert hashes["sha256"] == hashlib.sha256(data).hexdigest()
+        finally:
+            os.unlink(tmp_path)
+        
+        with pytest.raises(HashError, match="File does not exist"):
+            scan_file(tmp_path)
+    
     def test_get_blake3_hash_file_not_found(self):
         """Test Blake3 hash with non-existent file."""
         with pytest.raises(HashError, match="File does not exist"):
@@ -49,11 +101,26 @@ class TestHash:
             assert hash_value.islower()  # Ensure lowercase
             
             # Test with explicit tool path
-            hash_value2 = get_sha256_hash(tmp_path, tool_path="sha256sum")
+            hash_value2 = get_sha256_hash(tmp_path, tool_path="sha256sum", use_native=False)
             assert hash_value2 == hash_value
             
         os.unlink(tmp_path)
     
+    def test_get_sha256_hash_native(self):
+        """Test in-process SHA256 hashing matches hashlib over the raw bytes."""
+        data = os.urandom(1024 * 1024 + 3)
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
+            tmp.write(data)
+            tmp_path = tmp.name
+        
+        try:
+            assert get_sha256_hash_native(tmp_path) == hashlib.sha256(data).hexdigest()
+        finally:
+            os.unlink(tmp_path)
+        
+        with pytest.raises(HashError, match="File does not exist"):
+            get_sha256_hash_native(tmp_path)
+    
     def test_get_sha256_hash_file_not_found(self):
         """Test SHA256 hash with non-existent file."""
         with pytest.raises(HashError, match="File does not exist"):
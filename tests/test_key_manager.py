@@ -6,7 +6,6 @@ import pytest
 import os
 import shutil
 from pathlib import Path
-from click.testing import CliRunner
 from unittest.mock import patch, MagicMock
 
 from historify.key_manager import (
@@ -17,23 +16,21 @@ from historify.key_manager import (
     extract_key_id_from_comment,
     KeyError
 )
-from historify.cli_init import init_repository
-from historify.cli import config
+from tests.helpers import copy_template_repository
 
 class TestKeyManager:
     """Test the key management functionality."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.runner = CliRunner()
-        self.test_repo_path = Path("test_repo_keys").absolute()
+    @pytest.fixture(autouse=True)
+    def setup_repo(self, tmp_path, template_repo):
+        """Set up test environment in a per-test temporary directory."""
+        self.test_repo_path = tmp_path / "test_repo_keys"
         
-        # Initialize a test repository
-        if not self.test_repo_path.exists():
-            init_repository(str(self.test_repo_path), "test-repo")
+        # Copy the session-wide template repository
+        copy_template_repository(template_repo, self.test_repo_path)
         
         # Create test keys directory
-        self.keys_dir = Path("test_keys").absolute()
+        self.keys_dir = tmp_path / "test_keys"
         self.keys_dir.mkdir(parents=True, exist_ok=True)
         
         # Copy fixture files
@@ -51,13 +48,6 @@ class TestKeyManager:
             f.write("untrusted comment: minisign public key ABC123DEF456ABCD\n")
             f.write("RWQDJTPAA/YOmvb04sV60T1mIznpvhqIX6XBIEyee5XAr/ZDzkpg7KAS\n")
     
-    def teardown_method(self):
-        """Clean up test environment."""
-        if self.test_repo_path.exists():
-            shutil.rmtree(self.test_repo_path)
-        if self.keys_dir.exists():
-            shutil.rmtree(self.keys_dir)
-    
     def test_extract_key_id_from_comment(self):
         """Test extracting key ID from comment line."""
         # Test with valid comment line
@@ -184,4 +174,23 @@ class TestKeyManager:
         # List keys
         keys = list_backed_up_keys(str(self.test_repo_path))
         assert len(keys) == 1
-        assert keys[0]["id"] == key_id
\ No newline at end of file
+        assert keys[0]["id"] == key_id    
+    def test_backup_visible_with_unchanged_dir_mtime(self):
+        """Test that a new backup is listed even if the keys directory mtime does not move."""
+        backup_public_key(str(self.test_repo_path), str(self.key1_path))
+        assert len(list_backed_up_keys(str(self.test_repo_path))) == 1
+        
+        keys_dir = self.test_repo_path / "db" / "keys"
+        st = os.stat(keys_dir)
+        
+        key2_path = self.keys_dir / "key2.pub"
+        with open(key2_path, "w") as f:
+            f.write("untrusted comment: minisign public key 0123456789ABCDEF\n")
+            f.write("RWQDJTPAA/YOmvb04sV60T1mIznpvhqIX6XBIEyee5XAr/ZDzkpg7KAS\n")
+        backup_public_key(str(self.test_repo_path), str(key2_path))
+        
+        # Simulate a filesystem with coarse timestamps
+        os.utime(keys_dir, ns=(st.st_atime_ns, st.st_mtime_ns))
+        
+        keys = list_backed_up_keys(str(self.test_repo_path))
+        assert {key["id"] for key in keys} == {"ABC123DEF456ABCD", "0123456789ABCDEF"}
@@ -3,8 +3,6 @@ Tests for the media packing functionality.
 """
 import pytest
 import os
-import tempfile
-import shutil
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -21,11 +19,11 @@ from historify.media_packer import (
 class TestMediaPacker:
     """Test the media packing functionality."""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup_temp_dir(self, tmp_path):
         """Set up test environment."""
-        # Create a temporary directory
-        self.temp_dir = tempfile.mkdtemp()
-        self.temp_path = Path(self.temp_dir)
+        self.temp_dir = str(tmp_path)
+        self.temp_path = tmp_path
         
         # Create some test archive files of different sizes
         self.archive1 = self.temp_path / "archive1.tar.gz"
@@ -42,10 +40,6 @@ class TestMediaPacker:
         with open(self.archive3, "wb") as f:
             f.write(b"c" * 3000)
     
-    def teardown_method(self):
-        """Clean up test environment."""
-        shutil.rmtree(self.temp_dir)
-    
     def test_calculate_archives_size(self):
         """Test calculating the total size of archives."""
         archives = [self.archive1, self.archive2, self.archive3]
@@ -128,7 +122,7 @@ class TestMediaPacker:
         assert "github.com/kwinsch/historify" in call_args['app_ident_str']
         
         # Check file operations
-        assert mock_iso.add_file.call_count == 2  # Once for each archive
+        assert mock_iso.add_fp.call_count == 2  # Once for each archive
         expected_iso_path = output_path.with_suffix('.iso')
         mock_iso.write.assert_called_once_with(str(expected_iso_path))
         mock_iso.close.assert_called_once()
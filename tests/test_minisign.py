@@ -1,7 +1,6 @@
 import pytest
 import os
 import shutil
-import tempfile
 from pathlib import Path
 import subprocess
 from historify.minisign import (
@@ -19,9 +18,10 @@ pytestmark = pytest.mark.skipif(
 
 class TestMinisign:
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup_temp_dir(self, tmp_path):
         """Create temporary test files and directories."""
-        self.temp_dir = tempfile.mkdtemp()
+        self.temp_dir = str(tmp_path)
         self.test_file = Path(self.temp_dir) / "test.txt"
         with open(self.test_file, "w") as f:
             f.write("This is test data for minisign")
@@ -33,10 +33,6 @@ class TestMinisign:
         self.unencrypted_key = self.fixture_dir / "unencrypted_minisign.key"
         self.unencrypted_pub = self.fixture_dir / "unencrypted_minisign.pub"
     
-    def teardown_method(self):
-        """Clean up temporary files."""
-        shutil.rmtree(self.temp_dir)
-    
     def test_sign_unencrypted(self):
         """Test signing with unencrypted key."""
         # Skip if fixtures don't exist
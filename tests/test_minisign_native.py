@@ -0,0 +1,115 @@
+"""
+Tests for the in-process (PyNaCl) minisign signature verification.
+"""
+import pytest
+import base64
+import hashlib
+from pathlib import Path
+
+nacl_signing = pytest.importorskip("nacl.signing")
+
+from historify.minisign import minisign_verify, minisign_verify_many
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+def load_signing_key(key_path: Path):
+    """Load the Ed25519 signing key and key ID from an unencrypted minisign secret key."""
+    data = base64.b64decode(key_path.read_text().splitlines()[1])
+    # sig_alg (2) + kdf_alg (2) + cksum_alg (2) + salt (32) + opslimit (8) + memlimit (8)
+    keynum_sk = data[54:]
+    key_id, secret_key = keynum_sk[:8], keynum_sk[8:72]
+    return nacl_signing.SigningKey(secret_key[:32]), key_id
+
+def write_signature(file_path: Path, key_path: Path, prehashed: bool = True,
+                    trusted_comment: str = "timestamp:1700000000") -> Path:
+    """Write a minisign-compatible .minisig file for file_path."""
+    signing_key, key_id = load_signing_key(key_path)
+    data = file_path.read_bytes()
+    if prehashed:
+        sig_alg, message = b"ED", hashlib.blake2b(data, digest_size=64).digest()
+    else:
+        sig_alg, message = b"Ed", data
+    signature = signing_key.sign(message).signature
+    global_sig = signing_key.sign(signature + trusted_comment.encode()).signature
+    
+    sig_path = Path(f"{file_path}.minisig")
+    sig_path.write_text(
+        "untrusted comment: signature from minisign secret key\n"
+        f"{base64.b64encode(sig_alg + key_id + signature).decode()}\n"
+        f"trusted comment: {trusted_comment}\n"
+        f"{base64.b64encode(global_sig).decode()}\n"
+    )
+    return sig_path
+
+class TestNativeMinisignVerify:
+    
+    @pytest.fixture(autouse=True)
+    def setup_temp_dir(self, tmp_path):
+        """Create a temporary test file."""
+        self.temp_dir = str(tmp_path)
+        self.test_file = Path(self.temp_dir) / "test.txt"
+        self.test_file.write_text("This is test data for minisign")
+        self.key = FIXTURE_DIR / "unencrypted_minisign.key"
+        self.pub = FIXTURE_DIR / "unencrypted_minisign.pub"
+    
+    @pytest.mark.parametrize("prehashed", [True, False])
+    def test_verify_signed_file(self, prehashed):
+        """Test verifying prehashed and legacy signatures."""
+        write_signature(self.test_file, self.key, prehashed=prehashed)
+        
+        success, message = minisign_verify(self.test_file, self.pub)
+        
+        assert success, f"Verification failed: {message}"
+        assert "Signature and comment signature verified" in message
+        assert "timestamp:1700000000" in message
+    
+    def test_verify_tampered_file(self):
+        """Test that a modified file fails verification."""
+        write_signature(self.test_file, self.key)
+        with open(self.test_file, "a") as f:
+            f.write("\nThis is tampering with the file")
+        
+        success, message = minisign_verify(self.test_file, self.pub)
+        
+        assert not success
+        assert "Signature verification failed" in message
+    
+    def test_verify_tampered_trusted_comment(self):
+        """Test that a modified trusted comment fails verification."""
+        sig_path = write_signature(self.test_file, self.key)
+        sig_path.write_text(sig_path.read_text().replace("timestamp:1700000000", "timestamp:1"))
+        
+        success, message = minisign_verify(self.test_file, self.pub)
+        
+        assert not success
+        assert "Comment signature verification failed" in message
+    
+    def test_verify_wrong_key(self):
+        """Test that a signature from another key is rejected."""
+        write_signature(self.test_file, self.key)
+        
+        success, message = minisign_verify(self.test_file, FIXTURE_DIR / "encrypted_minisign.pub")
+        
+        assert not success
+        assert "key id" in message
+    
+    def test_verify_many(self):
+        """Test verifying several files with one parsed public key."""
+        good = self.test_file
+        write_signature(good, self.key)
+        
+        tampered = Path(self.temp_dir) / "tampered.txt"
+        tampered.write_text("original")
+        write_signature(tampered, self.key)
+        tampered.write_text("modified")
+        
+        unsigned = Path(self.temp_dir) / "unsigned.txt"
+        unsigned.write_text("no signature")
+        
+        results = minisign_verify_many([good, tampered, unsigned], self.pub)
+        
+        assert list(results) == [good, tampered, unsigned]
+        assert results[good][0] is True
+        assert results[tampered] == (False, "Signature verification failed")
+        assert results[unsigned][0] is False
+        assert "Signature file does not exist" in results[unsigned][1]
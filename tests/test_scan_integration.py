@@ -6,50 +6,27 @@ import os
 import csv
 import shutil
 import time
-from pathlib import Path
-from click.testing import CliRunner
 from unittest.mock import patch, MagicMock
 
-from historify.cli import init, config, add_category, start_transaction, scan
+from historify.cli import config, add_category, scan
 from historify.cli_init import init_repository
-from historify.config import RepositoryConfig
-from historify.changelog import Changelog
-from historify.csv_manager import CSVManager
+from historify.csv_manager import CHANGELOG_HEADER
 
 class TestScanIntegration:
     """Integration tests for the scan command using the CLI."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        self.runner = CliRunner()
-        self.test_dir = Path("scan_integration_test")
-        
-        # Clean up previous test directory if it exists
-        if self.test_dir.exists():
-            shutil.rmtree(self.test_dir)
-            
-        # Create test directory
+    @pytest.fixture(autouse=True)
+    def setup_repo(self, tmp_path, minisign_keys):
+        """Set up test environment in a per-test temporary directory."""
+        self.test_dir = tmp_path / "scan_integration_test"
         self.test_dir.mkdir()
         
-        # Create test minisign keys
-        self.key_dir = self.test_dir / "keys"
-        self.key_dir.mkdir()
-        
-        # Create mock key files
-        self.minisign_key = self.key_dir / "test.key"
-        self.minisign_pub = self.key_dir / "test.pub"
-        
-        with open(self.minisign_key, "w") as f:
-            f.write("untrusted comment: minisign unencrypted secret key\n")
-            f.write("TESTKEY123456789\n")
-        
-        with open(self.minisign_pub, "w") as f:
-            f.write("untrusted comment: minisign public key\n")
-            f.write("TESTPUB987654321\n")
+        # Share the session-wide placeholder minisign keys
+        self.minisign_key, self.minisign_pub = minisign_keys
         
-        # Initialize repository through CLI
+        # Initialize repository
         self.repo_path = self.test_dir / "repo"
-        self.runner.invoke(init, [str(self.repo_path), "--name", "test-repo"])
+        init_repository(str(self.repo_path), "test-repo")
         
         # Configure minisign keys
         self.runner.invoke(config, ["minisign.key", str(self.minisign_key), str(self.repo_path)])
@@ -71,17 +48,9 @@ class TestScanIntegration:
         
         # Create the CSV file with headers
         with open(self.changelog_file, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "timestamp", "transaction_type", "path", "category", 
-                "size", "ctime", "mtime", "sha256", "blake3"
-            ])
-    
-    def teardown_method(self):
-        """Clean up test environment."""
-        if self.test_dir.exists():
-            shutil.rmtree(self.test_dir)
+            f.write(CHANGELOG_HEADER)
     
+    @pytest.mark.slow
     @patch('historify.cli_verify.minisign_verify', return_value=(True, "Signature verified"))
     @patch('historify.minisign.minisign_sign', return_value=True)
     def test_complete_workflow(self, mock_sign, mock_verify):